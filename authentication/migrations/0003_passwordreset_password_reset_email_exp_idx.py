@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="passwordreset",
+            index=models.Index(
+                fields=["email", "expires_at"], name="password_reset_email_exp_idx"
+            ),
+        ),
+    ]
@@ -11,6 +11,11 @@ class PasswordReset(models.Model):
 
     class Meta:
         db_table = "password_reset"
+        indexes = (
+            models.Index(
+                fields=("email", "expires_at"), name="password_reset_email_exp_idx"
+            ),
+        )
 
     email = models.EmailField()
     token = models.CharField(max_length=100)
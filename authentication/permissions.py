@@ -14,18 +14,17 @@ class OneDevicePermission(BasePermission):
         if not user or not user.is_authenticated:
             raise NotAuthenticated
 
-        try:
-            user_session = UserSession.objects.get(user=user, is_active=True)
-        except UserSession.DoesNotExist:
+        user_session = UserSession.objects.get_active_for(user.pk)
+        if user_session is None:
             raise NotAuthenticated
 
         token: AccessToken = cast(AccessToken, request.auth)
         ip = get_client_ip(request)
         fingerprint = request.headers.get("X-Fingerprint")
         if (
-            token.get("jti") != user_session.jti
-            or ip != user_session.ip_address
-            or fingerprint != user_session.fingerprint
+            token.get("jti") != user_session["jti"]
+            or ip != user_session["ip_address"]
+            or fingerprint != user_session["fingerprint"]
         ):
             raise NotAuthenticated
 
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils.timezone import now
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import (
@@ -35,16 +36,21 @@ class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
         refresh: RefreshToken = self.token_class(attrs.get("refresh"))
         self.deactivate_outstanding_tokens(refresh)
 
-        UserSession.objects.filter(user=user, is_active=True).update(is_active=False)
-
         access = AccessToken(attrs.get("access"))
-        UserSession.objects.create(
-            user=user,
-            jti=access["jti"],
-            user_agent=user_agent,
-            fingerprint=fingerprint,
-            ip_address=ip,
-        )
+        with transaction.atomic():
+            # concurrent logins of the user wait here, so the second one doesn't
+            # break the one active session constraint
+            User.objects.select_for_update().get(pk=user.pk)
+            UserSession.objects.filter(user=user, is_active=True).update(
+                is_active=False
+            )
+            UserSession.objects.create(
+                user=user,
+                jti=access["jti"],
+                user_agent=user_agent,
+                fingerprint=fingerprint,
+                ip_address=ip,
+            )
 
         serializer = UserSerializer(user, context=self.context)
         return {"user": serializer.data, **attrs}
@@ -3,6 +3,8 @@ from django.urls import reverse
 from rest_framework.response import Response
 from rest_framework.test import APITestCase
 
+from user.models import UserSession
+
 User = get_user_model()
 
 
@@ -57,3 +59,20 @@ class LoginTest(APITestCase):
         """Test login with incorrect email and password"""
         response = self._do_login("incorrectemail@domen.com", "IncorrectPassword")
         self.assertEqual(response.status_code, 401)
+
+    def test_login_twice_with_stale_active_session(self):
+        """Test repeated login replaces the active session left from before"""
+        user = User.objects.get(email=self._email)
+        UserSession.objects.create(user=user, jti="stale", fingerprint="stale")
+
+        for _ in range(2):
+            response = self.client.post(
+                self._login_url,
+                {"email": self._email, "password": self._password},
+                HTTP_X_FINGERPRINT="fingerprint",
+            )
+            self.assertEqual(response.status_code, 200)
+
+        active = UserSession.objects.filter(user=user, is_active=True)
+        self.assertEqual(active.count(), 1)
+        self.assertEqual(active.get().fingerprint, "fingerprint")
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.permissions import OneDevicePermission
+from user.models import UserSession
+
+User = get_user_model()
+
+
+class ProtectedView(APIView):
+    permission_classes = (IsAuthenticated, OneDevicePermission)
+
+    def get(self, request):
+        return Response()
+
+
+class TestOneDevicePermission(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="random@email.com",
+            password="qwerty12345!",
+            first_name="First",
+            last_name="Last",
+        )
+        self.token = AccessToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.session = UserSession.objects.create(
+                user=self.user,
+                jti=self.token["jti"],
+                fingerprint="fingerprint",
+                ip_address="127.0.0.1",
+            )
+
+    def get(self) -> Response:
+        request = APIRequestFactory().get(
+            "/protected/", REMOTE_ADDR="127.0.0.1", HTTP_X_FINGERPRINT="fingerprint"
+        )
+        force_authenticate(request, user=self.user, token=self.token)
+        return ProtectedView.as_view()(request)
+
+    def test_revoked_session_is_rejected(self):
+        # the active session is cached by the first request
+        self.assertEqual(self.get().status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.session.deactivate()
+
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_deleted_session_is_rejected(self):
+        self.assertEqual(self.get().status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.session.delete()
+
+        self.assertEqual(self.get().status_code, 401)
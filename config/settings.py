@@ -2,6 +2,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import environ
+from corsheaders.defaults import default_headers
 from django import __version__
 from yookassa import Configuration
 from yookassa.domain.common.user_agent import Version
@@ -194,6 +195,8 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
         "authentication.permissions.OneDevicePermission",
     ),
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.PageNumberPagination",
+    "PAGE_SIZE": 50,
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
 }
 
@@ -211,6 +214,9 @@ SIMPLE_JWT = {
 
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+# conditional requests of the schedule, see schedule/views.py
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ("ETag", "X-Schedule-Version", "X-Schedule-Range")
 
 PASSWORD_RESET_BASE_URL = env.str("PASSWORD_RESET_BASE_URL")
 PASSWORD_RESET_TOKEN_LIFETIME = timedelta(minutes=5)
@@ -233,7 +239,20 @@ CELERY_BEAT_SCHEDULE = {
     "notify_subscription_overdue": {
         "task": "subscriptions.tasks.notify_subscription_overdue",
         "schedule": 60,
-    }
+    },
+    "resume_enrollment_jobs": {
+        "task": "lessons.tasks.resume_enrollment_jobs",
+        "schedule": 300,
+    },
+}
+
+# widest date range of the schedule, see schedule/ranges.py
+SCHEDULE_MAX_RANGE = timedelta(days=env.int("SCHEDULE_MAX_RANGE_DAYS", 92))
+
+# write-behind buffer for variant answers, see variants/buffer.py
+VARIANT_ANSWER_BUFFER = {
+    "ENABLED": env.bool("VARIANT_ANSWER_BUFFER_ENABLED", False),
+    "FLUSH_DELAY": env.int("VARIANT_ANSWER_FLUSH_DELAY", 5),
 }
 
 PROFILE_IMAGE_COLORS = (
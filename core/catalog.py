@@ -0,0 +1,126 @@
+"""Кэш справочников.
+
+Справочник - маленькая редко меняющаяся таблица: каникулы, подписки. Его
+значения читаются из памяти процесса, затем из общего кэша и только потом
+из базы. Все они привязаны к версии справочника в общем кэше, которую
+меняют сигналы post_save и post_delete модели (см. signals.py приложений),
+после этого каждый процесс перечитывает данные при следующем обращении.
+"""
+
+import uuid
+from typing import Any
+from typing import Callable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+VALUE_TIMEOUT = 60 * 60 * 24
+# values kept in the memory of a process per catalog version
+MEMORY_SIZE = 256
+
+
+class Catalog:
+    def __init__(self, name: str):
+        self.name = name
+        self.version_key = f"catalog:{name}:version"
+        self._version: str | None = None
+        self._values: dict[str, Any] = {}
+
+    def get(self, key: str, load: Callable[[], Any]) -> Any:
+        """Возвращает значение справочника, при промахе вычисляя его через load.
+
+        Значение общее для всех запросов процесса, поэтому должно быть
+        неизменяемым, и не может быть None.
+        """
+
+        version = self.get_version()
+        if version != self._version:
+            self._version, self._values = version, {}
+        elif key in self._values:
+            return self._values[key]
+
+        shared_key = f"catalog:{self.name}:{version}:{key}"
+        value = cache.get(shared_key)
+        if value is None:
+            value = load()
+            cache.set(shared_key, value, VALUE_TIMEOUT)
+
+        if len(self._values) >= MEMORY_SIZE:
+            self._values = {}
+        self._values[key] = value
+        return value
+
+    def invalidate(self) -> None:
+        # bumped after the commit, otherwise a reader running before it would
+        # cache the old rows under the new version
+        transaction.on_commit(self.bump)
+
+    def bump(self) -> None:
+        """Сразу меняет версию справочника"""
+        cache.set(self.version_key, uuid.uuid4().hex, None)
+
+    def get_version(self) -> str:
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+
+class CatalogListMixin:
+    """Отдаёт список справочника заранее отрендеренным JSON.
+
+    Ключ строится только по параметрам пагинации в каноническом виде, поэтому
+    число записей в кэше ограничено числом страниц. Запросы с другими
+    параметрами обрабатываются без кэша.
+    """
+
+    catalog: Catalog
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_list_cache_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+
+        content = self.catalog.get(
+            key, lambda: self.render_list(request, *args, **kwargs)
+        )
+        return HttpResponse(content, content_type=request.accepted_renderer.media_type)
+
+    def get_list_cache_key(self, request) -> str | None:
+        renderer = request.accepted_renderer
+        if (
+            renderer.format != "json"
+            or request.accepted_media_type != renderer.media_type
+        ):
+            return None
+
+        paginator = self.paginator
+        allowed = {
+            getattr(paginator, "page_query_param", None),
+            getattr(paginator, "page_size_query_param", None),
+        } - {None}
+        params = {}
+        for name, values in request.query_params.lists():
+            if name not in allowed or len(values) != 1:
+                return None
+            value = values[0]
+            if not value.isdigit() or str(int(value)) != value:
+                return None
+            params[name] = value
+
+        page_size = params.get(getattr(paginator, "page_size_query_param", None))
+        if page_size is not None and paginator.get_page_size(request) != int(page_size):
+            return None
+        # next and previous links are absolute, built from the request's origin
+        origin = f"{request.scheme}://{request.get_host()}"
+        return f"list:{origin}" + "".join(
+            f":{name}={params[name]}" for name in sorted(params)
+        )
+
+    def render_list(self, request, *args, **kwargs) -> bytes:
+        response = super().list(request, *args, **kwargs)
+        return request.accepted_renderer.render(
+            response.data, request.accepted_media_type, self.get_renderer_context()
+        )
@@ -0,0 +1,211 @@
+import datetime
+import uuid
+from argparse import ArgumentParser
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from authentication.models import PasswordReset
+from lessons.models import Lesson
+from lessons.models import UserLesson
+from subscriptions.models import Subscription
+from subscriptions.models import UserSubscription
+from user.models import UserSession
+
+User = get_user_model()
+
+SEED_LESSONS = 20
+SEED_SESSIONS = 5
+SEED_BATCH = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on hot user-scoped queries and fail if a plan doesn't use "
+        "the index made for the query"
+    )
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            metavar="USERS",
+            help="Insert data for this many users and ANALYZE the tables before "
+            "EXPLAIN. Everything is rolled back afterwards. Without it the "
+            "command checks the data already in the database.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("EXPLAIN checks are supported only for PostgreSQL")
+
+        failed = []
+        with transaction.atomic():
+            if options["seed"]:
+                self.seed(options["seed"])
+
+            # the planner keeps its default settings: on realistic data and
+            # statistics it has to prefer the index on its own
+            for name, queryset, indexes in self.get_hot_queries():
+                plan = queryset.explain()
+                if any(index in plan for index in indexes):
+                    self.stdout.write(self.style.SUCCESS(f"{name}: ok"))
+                else:
+                    failed.append(name)
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f"{name}: expected {' or '.join(indexes)}\n{plan}"
+                        )
+                    )
+
+            if options["seed"]:
+                transaction.set_rollback(True)
+
+        if failed:
+            raise CommandError(f"Hot queries without their index: {', '.join(failed)}")
+
+    def seed(self, users_count: int) -> None:
+        now = timezone.now()
+        today = timezone.localdate()
+
+        users = User.objects.bulk_create(
+            User(
+                email=f"explain-{uuid.uuid4().hex}@example.com",
+                first_name="Explain",
+                last_name="Explain",
+                password="!",
+            )
+            for _ in range(users_count)
+        )
+        subscriptions = Subscription.objects.bulk_create(
+            Subscription(
+                title=f"Explain {number}",
+                price=0,
+                advantages=["Explain"],
+                with_home_work=bool(number % 2),
+            )
+            for number in range(3)
+        )
+        lessons = Lesson.objects.bulk_create(
+            Lesson(
+                title=f"Explain {day}",
+                content="Explain",
+                opens_at=today + datetime.timedelta(days=day),
+                kinescope_video_id="explain",
+            )
+            for day in range(SEED_LESSONS)
+        )
+        statuses = list(UserLesson.STATUS_CHOICES)
+
+        user_subscriptions = []
+        user_lessons = []
+        sessions = []
+        for number, user in enumerate(users):
+            subscription = subscriptions[number % len(subscriptions)]
+            user_subscriptions += (
+                UserSubscription(user=user, subscription=subscription),
+                UserSubscription(
+                    user=user,
+                    subscription=subscriptions[(number + 1) % len(subscriptions)],
+                    status=UserSubscription.CANCELED,
+                    canceled_at=now,
+                ),
+            )
+            user_lessons += (
+                UserLesson(
+                    lesson=lesson,
+                    user=user,
+                    subscription=subscription,
+                    status=statuses[(number + day) % len(statuses)],
+                    complete_tasks_deadline=now,
+                    opens_at=lesson.opens_at,
+                )
+                for day, lesson in enumerate(lessons)
+            )
+            sessions += (
+                UserSession(
+                    user=user,
+                    jti=uuid.uuid4().hex,
+                    fingerprint="explain",
+                    is_active=session == 0,
+                )
+                for session in range(SEED_SESSIONS)
+            )
+        UserSubscription.objects.bulk_create(user_subscriptions, batch_size=SEED_BATCH)
+        UserLesson.objects.bulk_create(user_lessons, batch_size=SEED_BATCH)
+        UserSession.objects.bulk_create(sessions, batch_size=SEED_BATCH)
+        PasswordReset.objects.bulk_create(
+            (
+                PasswordReset(
+                    email=user.email,
+                    token="explain",
+                    expires_at=now + datetime.timedelta(hours=1),
+                )
+                for user in users
+            ),
+            batch_size=SEED_BATCH,
+        )
+
+        with connection.cursor() as cursor:
+            for model in (
+                User,
+                UserLesson,
+                UserSession,
+                UserSubscription,
+                PasswordReset,
+            ):
+                cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+
+    def get_hot_queries(self):
+        user_lesson = UserLesson._base_manager.values("user_id", "lesson_id").first()
+        user_id = user_lesson["user_id"] if user_lesson else uuid.uuid4()
+        lesson_id = user_lesson["lesson_id"] if user_lesson else uuid.uuid4()
+        subscription_id = (
+            UserSubscription.objects.filter(user_id=user_id)
+            .values_list("subscription_id", flat=True)
+            .first()
+        ) or uuid.uuid4()
+        email = (
+            PasswordReset.objects.values_list("email", flat=True).first()
+            or "user@example.com"
+        )
+
+        return (
+            (
+                "user_lesson by user and status",
+                UserLesson._base_manager.filter(
+                    user_id=user_id, status=UserLesson.COMPLETED
+                ),
+                ("user_lesson_user_status_idx",),
+            ),
+            (
+                "user_lesson by user and lesson",
+                UserLesson._base_manager.filter(user_id=user_id, lesson_id=lesson_id),
+                ("user_lesson_user_lesson_uniq",),
+            ),
+            (
+                "active user_session",
+                UserSession.objects.filter(user_id=user_id, is_active=True),
+                # the partial unique index covers the same rows
+                ("user_session_user_active_idx", "user_session_one_active"),
+            ),
+            (
+                "active user_subscription",
+                UserSubscription.objects.filter(
+                    user_id=user_id,
+                    status=UserSubscription.ACTIVE,
+                    subscription_id=subscription_id,
+                ),
+                ("user_sub_user_status_sub_idx",),
+            ),
+            (
+                "password_reset by email",
+                PasswordReset.objects.filter(
+                    email=email, expires_at__gt=timezone.now()
+                ),
+                ("password_reset_email_exp_idx",),
+            ),
+        )
@@ -1,6 +1,7 @@
 import uuid
 
 from django.db import models
+from django.utils import timezone
 
 
 class BaseModel(models.Model):
@@ -10,3 +11,20 @@ class BaseModel(models.Model):
     id = models.UUIDField("ID", primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField("Время создания", auto_now_add=True)
     updated_at = models.DateTimeField("Время обновления", auto_now=True)
+
+    def transition(self, expected: dict, **changes) -> bool:
+        """Меняет поля записи, только если в базе у неё ещё ожидаемые значения.
+
+        Выполняет UPDATE ... WHERE id = ... AND <expected> только по изменённым
+        полям и updated_at. Возвращает False, если запись уже изменили,
+        например повторным нажатием кнопки.
+        """
+
+        changes["updated_at"] = timezone.now()
+        updated = (
+            type(self)._base_manager.filter(pk=self.pk, **expected).update(**changes)
+        )
+        if updated:
+            for field, value in changes.items():
+                setattr(self, field, value)
+        return bool(updated)
@@ -0,0 +1,183 @@
+import base64
+import binascii
+import datetime
+import json
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.pagination import PageNumberPagination as BasePageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class PageNumberPagination(BasePageNumberPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """Курсорная пагинация по набору полей (keyset).
+
+    Следующая страница выбирается условием на значения полей последней записи,
+    поэтому глубокие страницы не деградируют, как при OFFSET. Порядок NULL
+    совпадает с PostgreSQL: NULLS LAST по возрастанию и NULLS FIRST по убыванию.
+    Последнее поле ordering должно быть уникальным.
+    """
+
+    ordering: tuple[str, ...] = ("id",)
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.next_position = None
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_after_filter(position))
+
+        results = list(queryset[: self.page_size + 1])
+        if len(results) > self.page_size:
+            results = results[: self.page_size]
+            self.next_position = self.get_position(results[-1])
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_next_link(self) -> str | None:
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_after_filter(self, position: list) -> Q:
+        after = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            descending = field.startswith("-")
+            after |= equal & self._get_beyond_filter(name, value, descending)
+            if value is None:
+                equal &= Q(**{f"{name}__isnull": True})
+            else:
+                equal &= Q(**{name: value})
+        return after
+
+    def get_position(self, obj) -> list:
+        position = []
+        for field in self.ordering:
+            value = obj
+            for attr in field.lstrip("-").split("__"):
+                value = getattr(value, attr)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, position: list) -> str:
+        data = json.dumps([self._serialize(value) for value in position])
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, request, model) -> list | None:
+        """Разбирает курсор и приводит значения к типам полей ordering"""
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                self._deserialize(field, value)
+                for field, value in zip(self.get_ordering_fields(model), position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_ordering_fields(self, model) -> list:
+        fields = []
+        for name in self.ordering:
+            opts = model._meta
+            for attr in name.lstrip("-").split("__"):
+                field = opts.get_field(attr)
+                if field.is_relation:
+                    opts = field.related_model._meta
+            fields.append(field)
+        return fields
+
+    @staticmethod
+    def _get_beyond_filter(name: str, value, descending: bool) -> Q:
+        if descending:
+            if value is None:
+                return Q(**{f"{name}__isnull": False})
+            return Q(**{f"{name}__lt": value})
+        if value is None:
+            return Q(pk__in=[])
+        return Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+
+    @staticmethod
+    def _deserialize(field, value):
+        if value is None:
+            if not field.null:
+                raise ValidationError("Field is not nullable")
+            return None
+        # lists and objects from a tampered cursor are not field values
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValidationError("Unexpected value type")
+        value = field.to_python(value)
+        if (
+            settings.USE_TZ
+            and isinstance(value, datetime.datetime)
+            and timezone.is_naive(value)
+        ):
+            raise ValidationError("Datetime without an offset")
+        return value
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
+
+
+class UserLessonPagination(KeysetPagination):
+    ordering = ("opens_at", "created_at", "id")
+
+
+class UserVariantPagination(KeysetPagination):
+    ordering = ("-completed_at", "started_at", "id")
@@ -1,3 +1,192 @@
+import base64
+import datetime
+import io
+import json
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase
 from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.catalog import Catalog
+from core.catalog import CatalogListMixin
+from core.pagination import PageNumberPagination
+from core.pagination import UserLessonPagination
+from lessons.models import Lesson
+from lessons.models import UserLesson
+
+User = get_user_model()
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCatalog(SimpleTestCase):
+    def test_read_through_and_invalidate(self):
+        catalog = Catalog("test_catalog")
+        loads = []
+
+        def load():
+            loads.append(1)
+            return len(loads)
+
+        self.assertEqual(catalog.get("key", load), 1)
+        self.assertEqual(catalog.get("key", load), 1)
+
+        # there is no transaction to wait for without a database
+        with mock.patch.object(transaction, "on_commit", lambda func: func()):
+            catalog.invalidate()
+        self.assertEqual(catalog.get("key", load), 2)
+        self.assertEqual(len(loads), 2)
+
+    def test_prerendered_list(self):
+        class ItemSerializer(serializers.Serializer):
+            with_home_work = serializers.BooleanField()
+
+        items = [{"with_home_work": True}]
+
+        class ItemsView(CatalogListMixin, ListAPIView):
+            queryset = items
+            serializer_class = ItemSerializer
+            permission_classes = (AllowAny,)
+            authentication_classes = ()
+            pagination_class = None
+            catalog = Catalog("test_items")
+
+        view = ItemsView.as_view()
+        first = view(APIRequestFactory().get("/items/"))
+        items.append({"with_home_work": False})
+        second = view(APIRequestFactory().get("/items/"))
+        # arbitrary query strings are not cached
+        uncached = view(APIRequestFactory().get("/items/?foo=bar"))
+
+        self.assertEqual(first.content, b'[{"withHomeWork":true}]')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], "application/json")
+        self.assertEqual(len(uncached.data), 2)
+
+    def test_list_cache_key(self):
+        class ItemsView(CatalogListMixin, ListAPIView):
+            queryset = []
+            permission_classes = (AllowAny,)
+            authentication_classes = ()
+            pagination_class = PageNumberPagination
+            catalog = Catalog("test_items")
+
+        def get_key(query: str, secure: bool = False) -> str | None:
+            view = ItemsView()
+            view.request = view.initialize_request(
+                APIRequestFactory().get(f"/items/?{query}", secure=secure)
+            )
+            view.format_kwarg = None
+            request = view.request
+            request.accepted_renderer, request.accepted_media_type = (
+                view.perform_content_negotiation(request)
+            )
+            return view.get_list_cache_key(request)
+
+        self.assertEqual(
+            get_key("page=2&page_size=10"),
+            "list:http://testserver:page=2:page_size=10",
+        )
+        self.assertEqual(get_key("", secure=True), "list:https://testserver")
+        for query in ("page=02", "page=1&page=2", "page_size=1000", "foo=bar"):
+            self.assertIsNone(get_key(query))
+
+
+class TestKeysetPagination(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="random@email.com",
+            password="qwerty12345!",
+            first_name="First",
+            last_name="Last",
+        )
+        today = datetime.date.today()
+        # three lessons open on the same day, so the cursor has to break ties
+        self.user_lessons = [
+            self.create_user_lesson(today + datetime.timedelta(days=days))
+            for days in (0, 1, 1, 1, 2)
+        ]
+        self.user_lessons.sort(key=lambda obj: (obj.opens_at, obj.created_at, obj.pk))
+
+    def create_user_lesson(self, opens_at: datetime.date) -> UserLesson:
+        lesson = Lesson.objects.create(
+            title="Title",
+            content="Content",
+            opens_at=opens_at,
+            kinescope_video_id="video",
+        )
+        return UserLesson.objects.create(
+            lesson=lesson, user=self.user, complete_tasks_deadline=timezone.now()
+        )
+
+    def paginate(self, url: str) -> tuple[list, str | None]:
+        paginator = UserLessonPagination()
+        request = Request(APIRequestFactory().get(url))
+        results = paginator.paginate_queryset(
+            UserLesson.objects.filter(user=self.user), request
+        )
+        return results, paginator.get_next_link()
+
+    def test_pages(self):
+        first, next_link = self.paginate("/lessons/?page_size=2")
+        second, next_link = self.paginate(next_link)
+        third, next_link = self.paginate(next_link)
+
+        self.assertEqual(first + second + third, self.user_lessons)
+        self.assertEqual(len(third), 1)
+        self.assertIsNone(next_link)
+
+    def test_ties(self):
+        # every page ends inside the group of lessons opening on the same day
+        pages = []
+        next_link = "/lessons/?page_size=1"
+        while next_link:
+            results, next_link = self.paginate(next_link)
+            pages += results
+
+        self.assertEqual(pages, self.user_lessons)
+
+    def test_invalid_cursor(self):
+        def encode(position) -> str:
+            return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+        valid = ["2024-01-01", "2024-01-01T00:00:00+00:00", str(uuid.uuid4())]
+        cursors = (
+            "not-base64!",
+            encode(valid[:2]),
+            encode(["not-a-date", *valid[1:]]),
+            encode([valid[0], "2024-01-01T00:00:00", valid[2]]),
+            encode([valid[0], valid[1], "not-a-uuid"]),
+            encode([None, *valid[1:]]),
+            encode([[1], *valid[1:]]),
+        )
+        for cursor in cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(f"/lessons/?cursor={cursor}")
+
+        self.paginate(f"/lessons/?cursor={encode(valid)}")
+
+
+class TestExplainHotQueries(TestCase):
+    def test_plans_use_indexes(self):
+        stdout = io.StringIO()
+        # raises CommandError if a plan doesn't use the index of its query
+        call_command("explainhotqueries", seed=1000, stdout=stdout)
 
-# Create your tests here.
+        self.assertEqual(stdout.getvalue().count(": ok"), 5)
+        self.assertFalse(UserLesson.objects.exists())
@@ -0,0 +1,10 @@
+def build_absolute_url(context: dict, url: str) -> str:
+    """Строит абсолютный URL файла, адрес сайта вычисляется один раз на контекст сериализатора"""
+
+    if "://" in url:
+        return url
+    base_url = context.get("base_url")
+    if base_url is None:
+        base_url = context["request"].build_absolute_uri("/").rstrip("/")
+        context["base_url"] = base_url
+    return base_url + url
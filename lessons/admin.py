@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
+from .models import EnrollmentJob
 from .models import Lesson
 from .models import LessonFile
 from .models import UserLesson
@@ -12,6 +13,25 @@ class LessonFileInline(admin.TabularInline):
     fields = ("name", "file")
 
 
+class EnrollmentJobInline(admin.TabularInline):
+    model = EnrollmentJob
+    extra = 0
+    can_delete = False
+    fields = (
+        "kind",
+        "status",
+        "user_lessons_created",
+        "user_tasks_created",
+        "created_at",
+        "finished_at",
+        "error",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Lesson)
 class LessonAdmin(admin.ModelAdmin):
     list_display = (
@@ -31,7 +51,7 @@ class LessonAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("kinescope_link", "kinescope_video_id")
     list_filter = ("author",)
-    inlines = [LessonFileInline]
+    inlines = [LessonFileInline, EnrollmentJobInline]
     filter_horizontal = ("tasks", "subscriptions")
 
     def kinescope_link(self, obj):
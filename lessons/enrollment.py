@@ -0,0 +1,273 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from lessons.models import EnrollmentJob
+from lessons.models import Lesson
+from lessons.models import UserLesson
+from subscriptions.models import UserSubscription
+from tasks.models import UserTask
+
+ENROLLMENT_BATCH_SIZE = 1000
+
+
+class EnrollmentResult(NamedTuple):
+    user_lessons: int = 0
+    user_tasks: int = 0
+
+    def __add__(self, other):
+        return EnrollmentResult(
+            self.user_lessons + other.user_lessons,
+            self.user_tasks + other.user_tasks,
+        )
+
+
+def iter_user_lesson_batches(
+    lesson: Lesson, *, after=None, batch_size: int = ENROLLMENT_BATCH_SIZE
+) -> Iterator[list[tuple]]:
+    """Возвращает уроки пользователей пачками пар (id, user_id), упорядоченными по id"""
+
+    queryset = UserLesson._base_manager.filter(lesson=lesson).order_by("pk")
+    while True:
+        batch_queryset = queryset if after is None else queryset.filter(pk__gt=after)
+        batch = list(batch_queryset.values_list("pk", "user_id")[:batch_size])
+        if not batch:
+            return
+        yield batch
+        after = batch[-1][0]
+
+
+def add_tasks_to_user_lessons(user_lessons: list[tuple], task_ids: Iterable) -> int:
+    """Создает недостающие задачи пользователей для пачки уроков пользователей"""
+
+    task_ids = list(task_ids)
+    user_lesson_ids = [user_lesson_id for user_lesson_id, _ in user_lessons]
+    existing = set(
+        UserTask._base_manager.filter(
+            lesson_id__in=user_lesson_ids, task_id__in=task_ids
+        ).values_list("lesson_id", "task_id")
+    )
+
+    user_tasks = [
+        UserTask(task_id=task_id, user_id=user_id, lesson_id=user_lesson_id)
+        for user_lesson_id, user_id in user_lessons
+        for task_id in task_ids
+        if (user_lesson_id, task_id) not in existing
+    ]
+    # tasks inserted by a concurrent enroll_user are skipped, but still counted
+    UserTask.objects.bulk_create(
+        user_tasks, batch_size=ENROLLMENT_BATCH_SIZE, ignore_conflicts=True
+    )
+    return len(user_tasks)
+
+
+def add_tasks_to_lesson(
+    lesson: Lesson, task_ids: Iterable, *, batch_size: int = ENROLLMENT_BATCH_SIZE
+) -> int:
+    """Добавляет задачи во все уроки пользователей, созданные по уроку"""
+
+    task_ids = list(task_ids)
+    created = 0
+    for user_lessons in iter_user_lesson_batches(lesson, batch_size=batch_size):
+        with transaction.atomic():
+            created += add_tasks_to_user_lessons(user_lessons, task_ids)
+    return created
+
+
+def iter_subscriber_batches(
+    subscription_ids: Iterable, *, after=None, batch_size: int = ENROLLMENT_BATCH_SIZE
+) -> Iterator[list[tuple]]:
+    """Возвращает активных подписчиков пачками пар (user_id, subscription_id), упорядоченными по user_id"""
+
+    queryset = UserSubscription.objects.filter(
+        subscription_id__in=list(subscription_ids),
+        status=UserSubscription.ACTIVE,
+    ).order_by("user_id", "created_at")
+    while True:
+        batch_queryset = (
+            queryset if after is None else queryset.filter(user_id__gt=after)
+        )
+        batch = list(
+            batch_queryset.values_list("user_id", "subscription_id")[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        after = batch[-1][0]
+
+
+def enroll_subscribers_batch(
+    lesson: Lesson, subscribers: list[tuple], task_ids: Iterable
+) -> EnrollmentResult:
+    """Создает уроки и задачи пользователей для пачки подписчиков, еще не записанных на урок"""
+
+    subscription_by_user = {}
+    for user_id, subscription_id in subscribers:
+        subscription_by_user.setdefault(user_id, subscription_id)
+
+    enrolled = set(
+        UserLesson._base_manager.filter(
+            lesson=lesson, user_id__in=list(subscription_by_user)
+        ).values_list("user_id", flat=True)
+    )
+    deadline = UserLesson.end_of_day(timezone.now())
+    user_lessons = [
+        UserLesson(
+            lesson=lesson,
+            user_id=user_id,
+            subscription_id=subscription_id,
+            complete_tasks_deadline=deadline,
+            opens_at=lesson.opens_at,
+        )
+        for user_id, subscription_id in subscription_by_user.items()
+        if user_id not in enrolled
+    ]
+    UserLesson.objects.bulk_create(
+        user_lessons, batch_size=ENROLLMENT_BATCH_SIZE, ignore_conflicts=True
+    )
+
+    # users enrolled by a concurrent enroll_user are skipped together with their
+    # tasks; ignore_conflicts doesn't tell which rows were inserted
+    inserted = set(
+        UserLesson._base_manager.filter(
+            pk__in=[user_lesson.pk for user_lesson in user_lessons]
+        ).values_list("pk", flat=True)
+    )
+    user_lessons = [
+        user_lesson for user_lesson in user_lessons if user_lesson.pk in inserted
+    ]
+
+    user_tasks = [
+        UserTask(task_id=task_id, user_id=user_lesson.user_id, lesson=user_lesson)
+        for user_lesson in user_lessons
+        for task_id in task_ids
+    ]
+    UserTask.objects.bulk_create(
+        user_tasks, batch_size=ENROLLMENT_BATCH_SIZE, ignore_conflicts=True
+    )
+    return EnrollmentResult(len(user_lessons), len(user_tasks))
+
+
+def enroll_subscribers(
+    lesson: Lesson,
+    subscription_ids: Iterable,
+    *,
+    batch_size: int = ENROLLMENT_BATCH_SIZE,
+) -> EnrollmentResult:
+    """Записывает на урок всех активных подписчиков переданных подписок"""
+
+    task_ids = list(lesson.tasks.values_list("pk", flat=True))
+    result = EnrollmentResult()
+    with transaction.atomic():
+        for subscribers in iter_subscriber_batches(
+            subscription_ids, batch_size=batch_size
+        ):
+            result += enroll_subscribers_batch(lesson, subscribers, task_ids)
+    return result
+
+
+def enroll_user(user_id, subscription_id, lessons) -> None:
+    """Записывает пользователя на уроки вместе с их задачами.
+
+    Выполняет постоянное число запросов. Повторный вызов ничего не создаёт,
+    дубликаты отсекают уникальные ограничения (пользователь, урок) и (урок, задача).
+    """
+
+    with transaction.atomic():
+        lesson_tasks = list(lessons.values_list("pk", "opens_at", "tasks"))
+        opens_at = {lesson_id: date for lesson_id, date, _ in lesson_tasks}
+        if not opens_at:
+            return
+
+        deadline = UserLesson.end_of_day(timezone.now())
+        UserLesson.objects.bulk_create(
+            [
+                UserLesson(
+                    lesson_id=lesson_id,
+                    user_id=user_id,
+                    subscription_id=subscription_id,
+                    complete_tasks_deadline=deadline,
+                    opens_at=date,
+                )
+                for lesson_id, date in opens_at.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+        # ignore_conflicts doesn't return primary keys
+        user_lesson_ids = dict(
+            UserLesson._base_manager.filter(
+                user_id=user_id, lesson_id__in=list(opens_at)
+            ).values_list("lesson_id", "pk")
+        )
+        UserTask.objects.bulk_create(
+            [
+                UserTask(
+                    task_id=task_id,
+                    user_id=user_id,
+                    lesson_id=user_lesson_ids[lesson_id],
+                )
+                for lesson_id, _, task_id in lesson_tasks
+                if task_id is not None
+            ],
+            batch_size=ENROLLMENT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+
+def run_job_batch(job_id, *, batch_size: int = ENROLLMENT_BATCH_SIZE) -> bool:
+    """Обрабатывает следующую пачку фоновой записи и сохраняет контрольную точку.
+
+    Возвращает False, когда обрабатывать больше нечего.
+    """
+
+    with transaction.atomic():
+        job = (
+            EnrollmentJob.objects.select_for_update()
+            .select_related("lesson")
+            .get(pk=job_id)
+        )
+        if job.is_finished:
+            return False
+
+        if job.kind == EnrollmentJob.ADD_TASKS:
+            batches = iter_user_lesson_batches(
+                job.lesson, after=job.checkpoint, batch_size=batch_size
+            )
+        else:
+            batches = iter_subscriber_batches(
+                job.object_ids, after=job.checkpoint, batch_size=batch_size
+            )
+
+        batch = next(batches, None)
+        if batch is None:
+            job.status = EnrollmentJob.COMPLETED
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "finished_at", "updated_at"])
+            return False
+
+        if job.kind == EnrollmentJob.ADD_TASKS:
+            result = EnrollmentResult(
+                user_tasks=add_tasks_to_user_lessons(batch, job.object_ids)
+            )
+        else:
+            task_ids = list(job.lesson.tasks.values_list("pk", flat=True))
+            result = enroll_subscribers_batch(job.lesson, batch, task_ids)
+
+        job.status = EnrollmentJob.RUNNING
+        job.checkpoint = batch[-1][0]
+        job.user_lessons_created += result.user_lessons
+        job.user_tasks_created += result.user_tasks
+        job.save(
+            update_fields=[
+                "status",
+                "checkpoint",
+                "user_lessons_created",
+                "user_tasks_created",
+                "updated_at",
+            ]
+        )
+        return True
@@ -5,21 +5,50 @@ from django.db import models
 from django.http import Http404
 from django.utils import timezone
 
+from subscriptions.models import UserSubscription
+from tasks.models import UserTask
+
 User = get_user_model()
 
 
 class UserLessonQuerySet(models.QuerySet):
     def all_available_for(self, user: User):
         """Возвращает уроки, которые были куплены пользователем, то есть доступные ему"""
-        return self.filter(lesson__opens_at__lte=timezone.now(), user=user)
+        return self.filter(opens_at__lte=timezone.now(), user=user)
 
     def available_for(self, pk: str, user: User):
         """Возвращает урок, который были куплен пользователем, то есть доступный ему"""
 
         return self.filter(
-            lesson__pk=pk, lesson__opens_at__lte=timezone.now(), user=user
+            lesson__pk=pk, opens_at__lte=timezone.now(), user=user
         ).first()
 
+    def with_tasks(self):
+        """Подгружает задачи урока вместе с файлами, упорядоченные по времени создания"""
+
+        return self.prefetch_related(
+            models.Prefetch(
+                "tasks",
+                queryset=UserTask.objects.prefetch_related("task__files").order_by(
+                    "created_at"
+                ),
+                to_attr="ordered_tasks",
+            )
+        )
+
+    def for_list(self):
+        """Подгружает автора, его активные подписки и подписку урока для списков уроков"""
+
+        return self.select_related("lesson__author", "subscription").prefetch_related(
+            models.Prefetch(
+                "lesson__author__subscriptions",
+                queryset=UserSubscription.objects.filter(
+                    status=UserSubscription.ACTIVE
+                ).select_related("subscription"),
+                to_attr="active_subscriptions",
+            )
+        )
+
 
 class UserLessonManager(models.Manager):
     def get_queryset(self) -> UserLessonQuerySet:
@@ -37,8 +66,11 @@ class UserLessonManager(models.Manager):
     def all_available_for(self, user: User):
         return self.get_queryset().all_available_for(user)
 
-    def available_for_or_404(self, pk: str, user: User):
-        obj = self.get_queryset().available_for(pk, user)
+    def available_for_or_404(self, pk: str, user: User, *, with_tasks: bool = False):
+        queryset = self.get_queryset()
+        if with_tasks:
+            queryset = queryset.with_tasks()
+        obj = queryset.available_for(pk, user)
         if not obj:
             raise Http404
         return obj
@@ -0,0 +1,123 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:00
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EnrollmentJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Время создания"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Время обновления"
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("add_tasks", "Добавление задач"),
+                            ("enroll_subscribers", "Запись подписчиков"),
+                        ],
+                        max_length=20,
+                        verbose_name="Тип",
+                    ),
+                ),
+                (
+                    "object_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.UUIDField(),
+                        help_text="Идентификаторы добавленных задач или подписок.",
+                        size=None,
+                        verbose_name="Объекты",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В очереди"),
+                            ("running", "Выполняется"),
+                            ("completed", "Завершена"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "checkpoint",
+                    models.UUIDField(
+                        blank=True,
+                        help_text="Последний обработанный урок пользователя или пользователь.",
+                        null=True,
+                        verbose_name="Контрольная точка",
+                    ),
+                ),
+                (
+                    "user_lessons_created",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Создано уроков пользователей"
+                    ),
+                ),
+                (
+                    "user_tasks_created",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Создано задач пользователей"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="Ошибка"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Время завершения"
+                    ),
+                ),
+                (
+                    "lesson",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="enrollment_jobs",
+                        to="lessons.lesson",
+                        verbose_name="Урок",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запись на урок",
+                "verbose_name_plural": "Записи на урок",
+                "db_table": "lesson_enrollment_job",
+                "ordering": ("-created_at",),
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0003_enrollmentjob"),
+        ("subscriptions", "0002_initial"),
+        ("tasks", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(fields=["opens_at"], name="lesson_opens_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userlesson",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="user_lesson_keyset_idx"
+            ),
+        ),
+    ]
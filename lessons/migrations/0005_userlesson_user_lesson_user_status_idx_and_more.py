@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0004_lesson_lesson_opens_at_idx_and_more"),
+        ("subscriptions", "0003_usersubscription_user_sub_user_status_sub_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userlesson",
+            index=models.Index(
+                fields=["user", "status"], name="user_lesson_user_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userlesson",
+            index=models.Index(
+                fields=["user", "lesson"], name="user_lesson_user_lesson_idx"
+            ),
+        ),
+    ]
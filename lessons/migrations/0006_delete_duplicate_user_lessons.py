@@ -0,0 +1,76 @@
+from django.db import migrations
+from django.db.models import Count
+
+# a later status means more progress
+STATUS_RANK = {"not_started": 0, "started": 1, "tasks_completed": 2, "completed": 3}
+
+
+def get_task_progress(user_task) -> int:
+    if user_task.answer is not None or user_task.answer_file:
+        return 2
+    return int(user_task.is_skipped)
+
+
+def merge_duplicate_user_lessons(apps, schema_editor):
+    """Оставляет один урок пользователя для каждой пары (пользователь, урок).
+
+    Остаётся дубликат с наибольшим прогрессом: по статусу, затем по числу
+    задач с ответом или пропуском. Задачи остальных дубликатов переносятся в
+    него, если в нём нет такой задачи или в ней меньше прогресса.
+    """
+
+    UserLesson = apps.get_model("lessons", "UserLesson")
+    UserTask = apps.get_model("tasks", "UserTask")
+    pairs = (
+        UserLesson.objects.order_by()
+        .values("user", "lesson")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values_list("user", "lesson")
+    )
+    for user_id, lesson_id in pairs:
+        tasks = {}
+        for user_task in UserTask.objects.filter(
+            lesson__user=user_id, lesson__lesson=lesson_id
+        ):
+            tasks.setdefault(user_task.lesson_id, []).append(user_task)
+
+        user_lessons = sorted(
+            UserLesson.objects.filter(user=user_id, lesson=lesson_id),
+            key=lambda obj: (
+                -STATUS_RANK.get(obj.status, 0),
+                -sum(bool(get_task_progress(t)) for t in tasks.get(obj.pk, ())),
+                obj.created_at,
+                obj.pk,
+            ),
+        )
+        kept, duplicates = user_lessons[0], user_lessons[1:]
+
+        kept_tasks = {t.task_id: t for t in tasks.get(kept.pk, ())}
+        for duplicate in duplicates:
+            for user_task in tasks.get(duplicate.pk, ()):
+                current = kept_tasks.get(user_task.task_id)
+                if current is not None:
+                    if get_task_progress(user_task) <= get_task_progress(current):
+                        continue
+                    current.delete()
+                user_task.lesson_id = kept.pk
+                user_task.save(update_fields=["lesson"])
+                kept_tasks[user_task.task_id] = user_task
+
+        duplicate_ids = [duplicate.pk for duplicate in duplicates]
+        # the tasks left are superseded by the tasks of the kept lesson
+        UserTask.objects.filter(lesson__in=duplicate_ids).delete()
+        UserLesson.objects.filter(pk__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0005_userlesson_user_lesson_user_status_idx_and_more"),
+        ("tasks", "0004_task_complexity"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_user_lessons, migrations.RunPython.noop),
+    ]
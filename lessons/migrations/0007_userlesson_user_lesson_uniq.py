@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0006_delete_duplicate_user_lessons"),
+        ("subscriptions", "0003_usersubscription_user_sub_user_status_sub_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="userlesson",
+            name="user_lesson_user_lesson_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="userlesson",
+            constraint=models.UniqueConstraint(
+                fields=("user", "lesson"), name="user_lesson_user_lesson_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0007_userlesson_user_lesson_uniq"),
+        ("subscriptions", "0003_usersubscription_user_sub_user_status_sub_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userlesson",
+            index=models.Index(
+                fields=["user", "complete_tasks_deadline"],
+                name="user_lesson_deadline_idx",
+            ),
+        ),
+    ]
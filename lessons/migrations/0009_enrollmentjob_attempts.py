@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0008_userlesson_user_lesson_deadline_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="enrollmentjob",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="Упавшая запись продолжается с контрольной точки, пока попыток меньше предела.",
+                verbose_name="Неудачных попыток",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db import models
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+
+def copy_opens_at(apps, schema_editor):
+    """Копирует дату открытия урока в уроки пользователей"""
+
+    Lesson = apps.get_model("lessons", "Lesson")
+    UserLesson = apps.get_model("lessons", "UserLesson")
+    UserLesson.objects.update(
+        opens_at=Subquery(
+            Lesson.objects.filter(pk=OuterRef("lesson")).values("opens_at")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0009_enrollmentjob_attempts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userlesson",
+            name="opens_at",
+            field=models.DateField(
+                editable=False, null=True, verbose_name="Когда открывается"
+            ),
+        ),
+        migrations.RunPython(copy_opens_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0010_userlesson_opens_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="userlesson",
+            name="opens_at",
+            field=models.DateField(editable=False, verbose_name="Когда открывается"),
+        ),
+        migrations.RemoveIndex(
+            model_name="userlesson",
+            name="user_lesson_keyset_idx",
+        ),
+        migrations.AddIndex(
+            model_name="userlesson",
+            index=models.Index(
+                fields=["user", "opens_at", "created_at", "id"],
+                name="user_lesson_keyset_idx",
+            ),
+        ),
+    ]
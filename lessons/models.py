@@ -1,11 +1,14 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db import transaction
 from django.utils import timezone
 
 from core.models import BaseModel
 from lessons.exceptions import *
 from lessons.managers import UserLessonManager
 from subscriptions.models import Subscription
+from tasks.grading import grade_many
 from tasks.models import Task
 from tasks.models import UserTask
 
@@ -19,6 +22,7 @@ class Lesson(BaseModel):
         db_table = "lesson"
         verbose_name = "Урок"
         verbose_name_plural = "Уроки"
+        indexes = (models.Index(fields=("opens_at",), name="lesson_opens_at_idx"),)
 
     title = models.CharField("Название", max_length=255, blank=False)
     kinescope_video_id = models.CharField(
@@ -55,6 +59,84 @@ class LessonFile(BaseModel):
     )
 
 
+class EnrollmentJob(BaseModel):
+    """Фоновая запись пользователей на урок, выполняется пачками с сохранением прогресса"""
+
+    ADD_TASKS = "add_tasks"
+    ENROLL_SUBSCRIBERS = "enroll_subscribers"
+    KIND_CHOICES = {
+        ADD_TASKS: "Добавление задач",
+        ENROLL_SUBSCRIBERS: "Запись подписчиков",
+    }
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    STATUS_CHOICES = {
+        PENDING: "В очереди",
+        RUNNING: "Выполняется",
+        COMPLETED: "Завершена",
+        FAILED: "Ошибка",
+    }
+
+    MAX_ATTEMPTS = 5
+
+    class Meta:
+        db_table = "lesson_enrollment_job"
+        ordering = ("-created_at",)
+        verbose_name = "Запись на урок"
+        verbose_name_plural = "Записи на урок"
+
+    lesson = models.ForeignKey(
+        Lesson,
+        verbose_name="Урок",
+        on_delete=models.CASCADE,
+        related_name="enrollment_jobs",
+    )
+    kind = models.CharField("Тип", max_length=20, choices=KIND_CHOICES)
+    object_ids = ArrayField(
+        models.UUIDField(),
+        verbose_name="Объекты",
+        help_text="Идентификаторы добавленных задач или подписок.",
+    )
+    status = models.CharField(
+        "Статус", max_length=10, choices=STATUS_CHOICES, default=PENDING
+    )
+    checkpoint = models.UUIDField(
+        "Контрольная точка",
+        null=True,
+        blank=True,
+        help_text="Последний обработанный урок пользователя или пользователь.",
+    )
+    user_lessons_created = models.PositiveIntegerField(
+        "Создано уроков пользователей", default=0
+    )
+    user_tasks_created = models.PositiveIntegerField(
+        "Создано задач пользователей", default=0
+    )
+    error = models.TextField("Ошибка", blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(
+        "Неудачных попыток",
+        default=0,
+        help_text="Упавшая запись продолжается с контрольной точки, пока попыток меньше предела.",
+    )
+    finished_at = models.DateTimeField("Время завершения", null=True, blank=True)
+
+    @property
+    def can_retry(self):
+        return self.status == self.FAILED and self.attempts < self.MAX_ATTEMPTS
+
+    @property
+    def is_finished(self):
+        return self.status == self.COMPLETED or (
+            self.status == self.FAILED and not self.can_retry
+        )
+
+    def __str__(self):
+        return f"{self.KIND_CHOICES.get(self.kind)} ({self.lesson.title})"
+
+
 class UserLesson(BaseModel):
     """Урок пользователя, который доступен ему"""
 
@@ -78,6 +160,25 @@ class UserLesson(BaseModel):
         )
         verbose_name = "Урок пользователя"
         verbose_name_plural = "Уроки пользователя"
+        indexes = (
+            models.Index(fields=("user", "status"), name="user_lesson_user_status_idx"),
+            # keyset pagination of user lessons, see UserLessonPagination
+            models.Index(
+                fields=("user", "opens_at", "created_at", "id"),
+                name="user_lesson_keyset_idx",
+            ),
+            # homework deadlines in the schedule date range, see schedule/events.py
+            models.Index(
+                fields=("user", "complete_tasks_deadline"),
+                name="user_lesson_deadline_idx",
+            ),
+        )
+        constraints = (
+            # also serves lookups by user and lesson
+            models.UniqueConstraint(
+                fields=("user", "lesson"), name="user_lesson_user_lesson_uniq"
+            ),
+        )
 
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="lessons")
@@ -88,15 +189,22 @@ class UserLesson(BaseModel):
     completed_at = models.DateTimeField(null=True, blank=True)
     complete_tasks_deadline = models.DateTimeField()
     subscription = models.ForeignKey(Subscription, on_delete=models.SET_NULL, null=True)
+    # copy of lesson.opens_at for the keyset index, kept in sync by lessons/signals.py
+    opens_at = models.DateField("Когда открывается", editable=False)
 
     objects = UserLessonManager()
 
     def save(self, *args, **kwargs):
-        self.complete_tasks_deadline = self.complete_tasks_deadline.replace(
-            hour=23, minute=59, second=59, microsecond=0
-        )
+        self.complete_tasks_deadline = self.end_of_day(self.complete_tasks_deadline)
+        if self.opens_at is None:
+            self.opens_at = self.lesson.opens_at
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def end_of_day(value):
+        """Дедлайн сдачи задач всегда приходится на конец дня"""
+        return value.replace(hour=23, minute=59, second=59, microsecond=0)
+
     @property
     def is_closed(self):
         return self.lesson.opens_at > timezone.localdate()
@@ -111,27 +219,25 @@ class UserLesson(BaseModel):
         elif self.is_completed:
             raise LessonAlreadyCompleted
 
-        self.status = self.COMPLETED
-        self.completed_at = timezone.now()
-        self.save()
+        if not self.transition(
+            {"status": self.status},
+            status=self.COMPLETED,
+            completed_at=timezone.now(),
+        ):
+            raise LessonAlreadyCompleted
 
+    @transaction.atomic
     def try_complete_tasks(self) -> None:
         if self.is_closed:
             raise LessonClosed
         elif self.status == self.TASKS_COMPLETED:
             raise LessonTasksAlreadyCompleted
 
-        self.status = self.TASKS_COMPLETED
-
-        user_tasks = list(self.tasks.select_related("task"))
-        for task in user_tasks:
-            task.is_correct = task.answer == task.task.correct_answer
-        UserTask.objects.bulk_update(user_tasks, ["is_correct"])
+        # the conditional update lets only one of concurrent requests grade tasks
+        if not self.transition({"status": self.status}, status=self.TASKS_COMPLETED):
+            raise LessonTasksAlreadyCompleted
 
-        self.tasks.filter(answer=None).exclude(type=Task.FILE).update(
-            is_correct=False, is_skipped=True
-        )
-        self.save()
+        grade_many(UserTask._base_manager.filter(lesson=self), skip_unanswered=True)
 
     def __str__(self):
         return f"{self.lesson.title} ({self.user.email})"
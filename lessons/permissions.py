@@ -1,6 +1,6 @@
 from rest_framework.permissions import BasePermission
 
-from subscriptions.models import UserSubscription
+from subscriptions.entitlements import get_entitlement
 
 
 class IsLessonOpened(BasePermission):
@@ -10,9 +10,4 @@ class IsLessonOpened(BasePermission):
 
 class HaveHomeworkAccess(BasePermission):
     def has_permission(self, request, view) -> bool:
-        has_with_home_work = UserSubscription.objects.filter(
-            user=request.user,
-            status=UserSubscription.ACTIVE,
-            subscription__with_home_work=True,
-        ).exists()
-        return has_with_home_work
+        return get_entitlement(request.user).has_home_work
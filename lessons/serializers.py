@@ -7,8 +7,10 @@ from rest_framework.serializers import SerializerMethodField
 from rest_framework.serializers import ValidationError
 
 from .models import *
+from core.utils import build_absolute_url
 from subscriptions.serializers import SubscriptionSerializer
 from tasks.serializers import UserTaskSerializer
+from user.serializers import AuthorSerializer
 from user.serializers import UserSerializer
 
 
@@ -23,9 +25,7 @@ class LessonFileSerializer(ModelSerializer):
         )
 
     def get_file(self, obj: LessonFile):
-        request = self.context.get("request")
-        file_url = obj.file.url
-        return request.build_absolute_uri(file_url)
+        return build_absolute_url(self.context, obj.file.url)
 
 
 class UserLessonSerializer(ModelSerializer):
@@ -92,11 +92,7 @@ class UserLessonSerializer(ModelSerializer):
         # remove tasks, if lesson not completed
         if self._should_hide_tasks(instance):
             self.fields.pop("tasks", None)
-
-        data = super().to_representation(instance)
-        if "tasks" in data:
-            data["tasks"] = sorted(data["tasks"], key=lambda task: task["created_at"])
-        return data
+        return super().to_representation(instance)
 
     def _should_hide_tasks(self, obj: UserLesson):
         return (
@@ -105,11 +101,10 @@ class UserLessonSerializer(ModelSerializer):
         ) or self.context.get("without_tasks", False)
 
     def _serialized_tasks(self, obj: UserLesson):
-        tasks = (
-            obj.tasks.prefetch_related("task", "task__files")
-            .all()
-            .order_by("created_at")
-        )
+        # tasks are prefetched by UserLessonQuerySet.with_tasks, already ordered
+        tasks = getattr(obj, "ordered_tasks", None)
+        if tasks is None:
+            tasks = obj.tasks.prefetch_related("task__files").order_by("created_at")
         context = self.context
         context.update(
             {"show_correct_answer": obj.status == UserLesson.TASKS_COMPLETED}
@@ -120,6 +115,16 @@ class UserLessonSerializer(ModelSerializer):
         return serializer.data
 
 
+class UserLessonListSerializer(UserLessonSerializer):
+    """Сериализатор для списков уроков, ожидает queryset из UserLessonQuerySet.for_list"""
+
+    def get_author(self, obj: UserLesson):
+        author = obj.lesson.author
+        if author:
+            return AuthorSerializer(author, context=self.context).data
+        return None
+
+
 class AnswerTaskSerializer(Serializer):
     answer = JSONField(required=False)
     answer_file = FileField(required=False)
@@ -0,0 +1,48 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.db.models import F
+from django.db.models import Q
+from django.utils import timezone
+
+from lessons.enrollment import run_job_batch
+from lessons.models import EnrollmentJob
+
+logger = logging.getLogger(__name__)
+
+STALE_JOB_TIMEOUT = timedelta(minutes=10)
+
+
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def run_enrollment_job(job_id):
+    try:
+        while run_job_batch(job_id):
+            pass
+    except Exception as e:
+        logger.error(f"Enrollment job {job_id} failed: {e.__class__.__name__}{e.args}")
+        now = timezone.now()
+        EnrollmentJob.objects.filter(pk=job_id).update(
+            status=EnrollmentJob.FAILED,
+            attempts=F("attempts") + 1,
+            error=f"{e.__class__.__name__}{e.args}",
+            updated_at=now,
+        )
+        # the job is given up, resume_enrollment_jobs won't retry it
+        EnrollmentJob.objects.filter(
+            pk=job_id, attempts__gte=EnrollmentJob.MAX_ATTEMPTS
+        ).update(finished_at=now)
+        raise
+
+
+@shared_task
+def resume_enrollment_jobs():
+    """Продолжает с контрольной точки прерванные записи на урок и упавшие, у которых остались попытки"""
+
+    stale_jobs = EnrollmentJob.objects.filter(
+        Q(status__in=(EnrollmentJob.PENDING, EnrollmentJob.RUNNING))
+        | Q(status=EnrollmentJob.FAILED, attempts__lt=EnrollmentJob.MAX_ATTEMPTS),
+        updated_at__lt=timezone.now() - STALE_JOB_TIMEOUT,
+    ).values_list("pk", flat=True)
+    for job_id in stale_jobs:
+        run_enrollment_job.delay(job_id)
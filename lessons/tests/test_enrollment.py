@@ -0,0 +1,195 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from lessons.enrollment import add_tasks_to_lesson
+from lessons.enrollment import enroll_subscribers
+from lessons.enrollment import enroll_user
+from lessons.enrollment import run_job_batch
+from lessons.models import *
+from lessons.tasks import STALE_JOB_TIMEOUT
+from lessons.tasks import resume_enrollment_jobs
+from lessons.tasks import run_enrollment_job
+from subscriptions.models import UserSubscription
+
+User = get_user_model()
+
+
+class TestEnrollment(TestCase):
+    _password = "qwerty12345!"
+
+    def setUp(self) -> None:
+        self.subscription = Subscription.objects.create(
+            title="Title", price=100, advantages=["Advantage"], with_home_work=True
+        )
+        self.users = [
+            User.objects.create_user(
+                email=f"user{i}@email.com",
+                password=self._password,
+                first_name="First",
+                last_name="Last",
+            )
+            for i in range(3)
+        ]
+        for user in self.users:
+            UserSubscription.objects.create(subscription=self.subscription, user=user)
+
+        self.tasks = [
+            Task.objects.create(name=f"Task {i}", content="Content", correct_answer="1")
+            for i in range(2)
+        ]
+        self.lesson = Lesson.objects.create(
+            title="Title",
+            content="Content",
+            opens_at=datetime.date.today(),
+            kinescope_video_id="video",
+        )
+        self.lesson.tasks.add(*self.tasks)
+
+    def test_enroll_subscribers(self):
+        result = enroll_subscribers(self.lesson, [self.subscription.pk], batch_size=2)
+
+        self.assertEqual(result.user_lessons, len(self.users))
+        self.assertEqual(result.user_tasks, len(self.users) * len(self.tasks))
+        for user in self.users:
+            user_lesson = UserLesson.objects.get(lesson=self.lesson, user=user)
+            self.assertEqual(user_lesson.subscription_id, self.subscription.pk)
+            self.assertEqual(user_lesson.tasks.filter(user=user).count(), 2)
+
+    def test_enroll_subscribers_twice(self):
+        enroll_subscribers(self.lesson, [self.subscription.pk])
+        result = enroll_subscribers(self.lesson, [self.subscription.pk])
+
+        self.assertEqual(result.user_lessons, 0)
+        self.assertEqual(result.user_tasks, 0)
+
+    def test_add_tasks_to_lesson(self):
+        enroll_subscribers(self.lesson, [self.subscription.pk])
+        task = Task.objects.create(name="New", content="Content", correct_answer="1")
+
+        created = add_tasks_to_lesson(self.lesson, [task.pk, self.tasks[0].pk])
+
+        self.assertEqual(created, len(self.users))
+        self.assertEqual(
+            UserTask.objects.filter(task=task, lesson__lesson=self.lesson).count(),
+            len(self.users),
+        )
+
+    def test_enroll_user_twice(self):
+        user = self.users[0]
+        lessons = Lesson.objects.filter(pk=self.lesson.pk)
+        enroll_user(user.pk, self.subscription.pk, lessons)
+        enroll_user(user.pk, self.subscription.pk, lessons)
+
+        user_lesson = UserLesson.objects.get(lesson=self.lesson, user=user)
+        self.assertEqual(user_lesson.subscription_id, self.subscription.pk)
+        self.assertEqual(
+            list(user_lesson.tasks.values_list("user_id", flat=True)),
+            [user.pk] * len(self.tasks),
+        )
+
+    def test_enroll_subscribers_racing_enroll_user(self):
+        user = self.users[0]
+        lessons = Lesson.objects.filter(pk=self.lesson.pk)
+        bulk_create = UserLesson.objects.bulk_create
+        raced = []
+
+        def enroll_user_first(*args, **kwargs):
+            # the webhook enrolls the user after the batch looked for enrolled users
+            if not raced:
+                raced.append(user)
+                enroll_user(user.pk, self.subscription.pk, lessons)
+            return bulk_create(*args, **kwargs)
+
+        with mock.patch.object(UserLesson.objects, "bulk_create", enroll_user_first):
+            result = enroll_subscribers(self.lesson, [self.subscription.pk])
+
+        self.assertEqual(result.user_lessons, len(self.users) - 1)
+        self.assertEqual(
+            UserLesson.objects.filter(lesson=self.lesson).count(), len(self.users)
+        )
+        self.assertEqual(
+            UserTask.objects.filter(lesson__lesson=self.lesson).count(),
+            len(self.users) * len(self.tasks),
+        )
+
+
+class TestEnrollmentJob(TestCase):
+    def setUp(self) -> None:
+        self.subscription = Subscription.objects.create(
+            title="Title", price=100, advantages=["Advantage"], with_home_work=True
+        )
+        self.users = [
+            User.objects.create_user(
+                email=f"user{i}@email.com",
+                password="qwerty12345!",
+                first_name="First",
+                last_name="Last",
+            )
+            for i in range(3)
+        ]
+        for user in self.users:
+            UserSubscription.objects.create(subscription=self.subscription, user=user)
+        self.lesson = Lesson.objects.create(
+            title="Title",
+            content="Content",
+            opens_at=datetime.date.today(),
+            kinescope_video_id="video",
+        )
+        self.job = EnrollmentJob.objects.create(
+            lesson=self.lesson,
+            kind=EnrollmentJob.ENROLL_SUBSCRIBERS,
+            object_ids=[self.subscription.pk],
+        )
+
+    def fail_job(self):
+        with mock.patch(
+            "lessons.enrollment.enroll_subscribers_batch", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                run_enrollment_job(self.job.pk)
+        self.job.refresh_from_db()
+
+    def make_stale(self):
+        EnrollmentJob.objects.filter(pk=self.job.pk).update(
+            updated_at=timezone.now() - STALE_JOB_TIMEOUT * 2
+        )
+
+    def test_interrupted_job_resumes_from_checkpoint(self):
+        self.assertTrue(run_job_batch(self.job.pk, batch_size=1))
+        self.job.refresh_from_db()
+        checkpoint = self.job.checkpoint
+
+        self.fail_job()
+        self.assertEqual(self.job.status, EnrollmentJob.FAILED)
+        self.assertEqual(self.job.attempts, 1)
+        self.assertEqual(self.job.checkpoint, checkpoint)
+        self.assertFalse(self.job.is_finished)
+
+        self.make_stale()
+        with mock.patch("lessons.tasks.run_enrollment_job.delay", run_enrollment_job):
+            resume_enrollment_jobs()
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, EnrollmentJob.COMPLETED)
+        self.assertEqual(self.job.user_lessons_created, len(self.users))
+        self.assertEqual(
+            UserLesson.objects.filter(lesson=self.lesson).count(), len(self.users)
+        )
+
+    def test_job_is_given_up_after_max_attempts(self):
+        EnrollmentJob.objects.filter(pk=self.job.pk).update(
+            status=EnrollmentJob.FAILED, attempts=EnrollmentJob.MAX_ATTEMPTS - 1
+        )
+
+        self.fail_job()
+        self.assertTrue(self.job.is_finished)
+        self.assertIsNotNone(self.job.finished_at)
+
+        self.make_stale()
+        with mock.patch("lessons.tasks.run_enrollment_job.delay") as delay:
+            resume_enrollment_jobs()
+        delay.assert_not_called()
@@ -0,0 +1,124 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from lessons.models import *
+from subscriptions.models import UserSubscription
+from tasks.models import TaskFile
+from user.models import UserSession
+
+User = get_user_model()
+
+
+class TestLessonsQueries(APITestCase):
+    _email = "random@email.com"
+    _password = "qwerty12345!"
+    _fingerprint = "fingerprint"
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email=self._email,
+            password=self._password,
+            first_name="First",
+            last_name="Last",
+        )
+        self.author = User.objects.create_user(
+            email="author@email.com",
+            password=self._password,
+            first_name="Author",
+            last_name="Author",
+        )
+        self.subscription = Subscription.objects.create(
+            title="Title", price=100, advantages=["Advantage"], with_home_work=True
+        )
+        UserSubscription.objects.create(
+            subscription=self.subscription, user=self.author
+        )
+
+        self.token = AccessToken.for_user(self.user)
+        UserSession.objects.create(
+            user=self.user,
+            jti=self.token["jti"],
+            fingerprint=self._fingerprint,
+            ip_address="127.0.0.1",
+        )
+
+    def _create_lessons(self, count: int):
+        for i in range(count):
+            lesson = Lesson.objects.create(
+                title=f"Title {i}",
+                content="Content",
+                opens_at=datetime.date.today(),
+                kinescope_video_id="video",
+                author=self.author,
+            )
+            UserLesson.objects.create(
+                lesson=lesson,
+                user=self.user,
+                subscription=self.subscription,
+                complete_tasks_deadline=timezone.now(),
+            )
+
+    def _count_list_queries(self) -> int:
+        self.client.force_authenticate(user=self.user, token=self.token)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("lesson_list"), HTTP_X_FINGERPRINT=self._fingerprint
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_lessons_list_query_count_is_constant(self):
+        self._create_lessons(1)
+        queries_for_one = self._count_list_queries()
+
+        self._create_lessons(10)
+        self.assertEqual(self._count_list_queries(), queries_for_one)
+
+    def _count_detail_queries(self, tasks_count: int) -> int:
+        lesson = Lesson.objects.create(
+            title="Title",
+            content="Content",
+            opens_at=datetime.date.today(),
+            kinescope_video_id="video",
+            author=self.author,
+        )
+        user_lesson = UserLesson.objects.create(
+            lesson=lesson,
+            user=self.user,
+            subscription=self.subscription,
+            complete_tasks_deadline=timezone.now(),
+        )
+        for i in range(tasks_count):
+            task = Task.objects.create(
+                name=f"Task {i}", content="Content", correct_answer="1"
+            )
+            TaskFile.objects.create(name="First", file="files/first.txt", task=task)
+            TaskFile.objects.create(name="Second", file="files/second.txt", task=task)
+            UserTask.objects.create(task=task, user=self.user, lesson=user_lesson)
+        UserLesson._base_manager.filter(pk=user_lesson.pk).update(
+            status=UserLesson.COMPLETED
+        )
+
+        self.client.force_authenticate(user=self.user, token=self.token)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("lesson_detail", args=[lesson.pk]),
+                HTTP_X_FINGERPRINT=self._fingerprint,
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["tasks"]), tasks_count)
+        return len(context.captured_queries)
+
+    def test_lesson_detail_query_count_is_constant(self):
+        queries_for_one = self._count_detail_queries(1)
+        self.assertEqual(self._count_detail_queries(30), queries_for_one)
@@ -0,0 +1,84 @@
+import datetime
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+
+class TestMergeDuplicateUserLessons(TransactionTestCase):
+    migrate_from = [
+        ("lessons", "0005_userlesson_user_lesson_user_status_idx_and_more"),
+        ("tasks", "0004_task_complexity"),
+    ]
+    migrate_to = [
+        ("lessons", "0006_delete_duplicate_user_lessons"),
+        ("tasks", "0005_delete_duplicate_user_tasks"),
+    ]
+
+    def setUp(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+
+        User = apps.get_model("user", "User")
+        Lesson = apps.get_model("lessons", "Lesson")
+        UserLesson = apps.get_model("lessons", "UserLesson")
+        Task = apps.get_model("tasks", "Task")
+        UserTask = apps.get_model("tasks", "UserTask")
+
+        user = User.objects.create(
+            email="random@email.com", first_name="First", last_name="Last"
+        )
+        lesson = Lesson.objects.create(
+            title="Title", content="Content", opens_at=datetime.date.today()
+        )
+        first_task, second_task = (
+            Task.objects.create(name="Task", content="Content", correct_answer="1")
+            for _ in range(2)
+        )
+
+        now = timezone.now()
+        older = UserLesson.objects.create(
+            lesson=lesson, user=user, status="started", complete_tasks_deadline=now
+        )
+        UserTask.objects.create(task=first_task, user=user, lesson=older, answer="1")
+        UserTask.objects.create(task=second_task, user=user, lesson=older)
+        # the newer duplicate has more progress and was the one served by the API
+        newer = UserLesson.objects.create(
+            lesson=lesson,
+            user=user,
+            status="tasks_completed",
+            complete_tasks_deadline=now,
+        )
+        UserLesson.objects.filter(pk=newer.pk).update(
+            created_at=now + datetime.timedelta(minutes=1)
+        )
+        UserTask.objects.create(task=first_task, user=user, lesson=newer)
+        UserTask.objects.create(task=second_task, user=user, lesson=newer, answer="2")
+        self.newer_id = newer.pk
+        self.task_ids = (first_task.pk, second_task.pk)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+        self.apps = executor.loader.project_state(self.migrate_to).apps
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_most_progressed_duplicate_is_kept_with_answers(self):
+        UserLesson = self.apps.get_model("lessons", "UserLesson")
+        UserTask = self.apps.get_model("tasks", "UserTask")
+
+        user_lesson = UserLesson.objects.get()
+        self.assertEqual(user_lesson.pk, self.newer_id)
+        self.assertEqual(user_lesson.status, "tasks_completed")
+
+        answers = dict(
+            UserTask.objects.filter(lesson=user_lesson).values_list("task", "answer")
+        )
+        # the answer from the older duplicate is moved onto the kept lesson
+        self.assertEqual(answers, dict(zip(self.task_ids, ("1", "2"))))
+        self.assertEqual(UserTask.objects.count(), 2)
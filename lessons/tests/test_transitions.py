@@ -0,0 +1,63 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from lessons.models import *
+from tasks.exceptions import TaskAlreadyAnswered
+
+User = get_user_model()
+
+
+class TestUserLessonTransitions(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="random@email.com",
+            password="qwerty12345!",
+            first_name="First",
+            last_name="Last",
+        )
+        self.lesson = Lesson.objects.create(
+            title="Title",
+            content="Content",
+            opens_at=datetime.date.today(),
+            kinescope_video_id="video",
+        )
+        self.user_lesson = UserLesson.objects.create(
+            lesson=self.lesson,
+            user=self.user,
+            complete_tasks_deadline=timezone.now(),
+        )
+
+    def test_double_complete(self):
+        stale = UserLesson.objects.get(pk=self.user_lesson.pk)
+        self.user_lesson.try_complete()
+
+        with self.assertRaises(LessonAlreadyCompleted):
+            stale.try_complete()
+
+        self.user_lesson.refresh_from_db()
+        self.assertEqual(self.user_lesson.status, UserLesson.COMPLETED)
+
+    def test_double_complete_tasks(self):
+        task = Task.objects.create(name="Task", content="Content", correct_answer="1")
+        UserTask.objects.create(task=task, user=self.user, lesson=self.user_lesson)
+        stale = UserLesson.objects.get(pk=self.user_lesson.pk)
+        self.user_lesson.try_complete_tasks()
+
+        with self.assertRaises(LessonTasksAlreadyCompleted):
+            stale.try_complete_tasks()
+        self.assertTrue(UserTask.objects.get(task=task).is_skipped)
+
+    def test_skip_answered_task(self):
+        task = Task.objects.create(name="Task", content="Content", correct_answer="1")
+        user_task = UserTask.objects.create(
+            task=task, user=self.user, lesson=self.user_lesson
+        )
+        stale = UserTask.objects.get(pk=user_task.pk)
+        user_task.try_answer("1")
+
+        with self.assertRaises(TaskAlreadyAnswered):
+            stale.try_skip()
+        self.assertFalse(UserTask.objects.get(pk=user_task.pk).is_skipped)
@@ -1,7 +1,7 @@
 from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
 from rest_framework import status
 from rest_framework.generics import GenericAPIView
-from rest_framework.generics import get_object_or_404
 from rest_framework.generics import ListAPIView
 from rest_framework.generics import RetrieveAPIView
 from rest_framework.parsers import FormParser
@@ -13,15 +13,54 @@ from rest_framework.views import APIView
 from .permissions import *
 from .serializers import *
 from authentication.permissions import OneDevicePermission
+from core.pagination import UserLessonPagination
 from tasks.models import UserTask
+from tasks.views import AnswerAckMixin
+
+
+class UserLessonMixin:
+    """Находит урок пользователя и проверяет права на него один раз за запрос"""
+
+    # prefetch lesson tasks, only for views that don't change them before serialization
+    with_tasks = False
+
+    def get_object(self) -> UserLesson:
+        if not hasattr(self, "_user_lesson"):
+            pk = self.kwargs["pk"]
+            obj = UserLesson.objects.available_for_or_404(
+                pk, self.request.user, with_tasks=self.with_tasks
+            )
+            self.check_object_permissions(self.request, obj)
+            self._user_lesson = obj
+        return self._user_lesson
+
+
+class UserLessonTaskMixin(AnswerAckMixin, UserLessonMixin):
+    """Находит задачу урока пользователя, которую собираются изменить"""
+
+    def _validate_tasks_not_completed(self, lesson: UserLesson):
+        if lesson.status == UserLesson.TASKS_COMPLETED:
+            raise LessonTasksAlreadyCompleted
+
+    def _get_user_lesson_task_or_fail(self, lesson: UserLesson) -> UserTask:
+        task = UserTask.objects.get_in_parent_or_fail(
+            self.kwargs["task_pk"],
+            self.request.user,
+            LessonNotIncludesTask,
+            for_update=True,
+            lesson=lesson,
+        )
+        self.check_object_permissions(self.request, task)
+        return task
 
 
 class LessonsView(ListAPIView):
     queryset = UserLesson.objects.all()
-    serializer_class = UserLessonSerializer
+    serializer_class = UserLessonListSerializer
+    pagination_class = UserLessonPagination
 
     def get_queryset(self):
-        return UserLesson.objects.filter(user=self.request.user)
+        return UserLesson.objects.filter(user=self.request.user).for_list()
 
     def filter_queryset(self, queryset):
         status = self.request.query_params.get("status")
@@ -40,12 +79,17 @@ class LessonsView(ListAPIView):
 
 class NotCompletedLessonsView(ListAPIView):
     queryset = UserLesson.objects.all()
-    serializer_class = UserLessonSerializer
+    serializer_class = UserLessonListSerializer
+    pagination_class = UserLessonPagination
 
     def get_queryset(self):
-        return UserLesson.objects.all_available_for(self.request.user).filter(
-            ~models.Q(status=UserLesson.COMPLETED)
-            & ~models.Q(status=UserLesson.TASKS_COMPLETED)
+        return (
+            UserLesson.objects.all_available_for(self.request.user)
+            .filter(
+                ~models.Q(status=UserLesson.COMPLETED)
+                & ~models.Q(status=UserLesson.TASKS_COMPLETED)
+            )
+            .for_list()
         )
 
     def get_serializer_context(self):
@@ -54,10 +98,11 @@ class NotCompletedLessonsView(ListAPIView):
         return context
 
 
-class LessonView(RetrieveAPIView):
+class LessonView(UserLessonMixin, RetrieveAPIView):
     queryset = UserLesson.objects.all()
     serializer_class = UserLessonSerializer
     permission_classes = (IsAuthenticated, OneDevicePermission, IsLessonOpened)
+    with_tasks = True
 
     def get(self, *args, **kwargs):
         return super().get(*args, **kwargs)
@@ -73,14 +118,8 @@ class LessonView(RetrieveAPIView):
         )
         return context
 
-    def get_object(self):
-        pk = self.kwargs["pk"]
-        obj = UserLesson.objects.available_for_or_404(pk, self.request.user)
-        self.check_object_permissions(self.request, obj)
-        return obj
-
 
-class CompleteLessonView(GenericAPIView):
+class CompleteLessonView(UserLessonMixin, GenericAPIView):
     queryset = UserLesson.objects.all()
     serializer_class = UserLessonSerializer
 
@@ -89,19 +128,13 @@ class CompleteLessonView(GenericAPIView):
         lesson.try_complete()
         return Response(self.get_serializer(lesson).data)
 
-    def get_object(self) -> UserLesson:
-        pk = self.kwargs["pk"]
-        obj = UserLesson.objects.available_for_or_404(pk, self.request.user)
-        self.check_object_permissions(self.request, obj)
-        return obj
-
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({"request": self.request, "without_tasks": True})
         return context
 
 
-class CompleteLessonTasksView(GenericAPIView):
+class CompleteLessonTasksView(UserLessonMixin, GenericAPIView):
     queryset = UserLesson.objects.all()
     permission_classes = (IsAuthenticated, OneDevicePermission, HaveHomeworkAccess)
     serializer_class = UserLessonSerializer
@@ -111,12 +144,6 @@ class CompleteLessonTasksView(GenericAPIView):
         lesson.try_complete_tasks()
         return Response(self.get_serializer(lesson).data)
 
-    def get_object(self) -> UserLesson:
-        pk = self.kwargs["pk"]
-        obj = UserLesson.objects.available_for_or_404(pk, self.request.user)
-        self.check_object_permissions(self.request, obj)
-        return obj
-
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({"request": self.request})
@@ -133,18 +160,22 @@ class LessonTaskView(RetrieveAPIView):
         return context
 
 
-class AnswerLessonTaskView(GenericAPIView):
+class AnswerLessonTaskView(UserLessonTaskMixin, GenericAPIView):
     queryset = UserTask.objects.all()
     serializer_class = UserLessonSerializer
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = (IsAuthenticated, OneDevicePermission, HaveHomeworkAccess)
 
     def post(self, request, *args, **kwargs):
-        lesson = self._get_user_lesson_or_fail()
+        lesson = self.get_object()
         self._validate_tasks_not_completed(lesson)
 
-        task = self._get_user_lesson_task_or_fail(lesson)
-        self._try_to_answer_task(task)
+        with transaction.atomic():
+            task = self._get_user_lesson_task_or_fail(lesson)
+            self._try_to_answer_task(task)
+
+        if self.wants_ack():
+            return self.get_ack_response(task, lesson=lesson)
 
         serialized_lesson = self.get_serializer(lesson)
         return Response(serialized_lesson.data, status=status.HTTP_200_OK)
@@ -154,25 +185,6 @@ class AnswerLessonTaskView(GenericAPIView):
         context.update({"request": self.request})
         return context
 
-    def _get_user_lesson_or_fail(self):
-        pk = self.kwargs["pk"]
-        lesson = UserLesson.objects.available_for_or_404(pk, self.request.user)
-        self.check_object_permissions(self.request, lesson)
-        return lesson
-
-    def _validate_tasks_not_completed(self, lesson: UserLesson):
-        if lesson.status == UserLesson.TASKS_COMPLETED:
-            raise LessonTasksAlreadyCompleted
-
-    def _get_user_lesson_task_or_fail(self, lesson: UserLesson) -> UserTask:
-        task_id = self.kwargs["task_pk"]
-        if not lesson.tasks.filter(pk=task_id).exists():
-            raise LessonNotIncludesTask
-
-        task = get_object_or_404(UserTask, pk=task_id)
-        self.check_object_permissions(self.request, task)
-        return task
-
     def _try_to_answer_task(self, task: UserTask):
         answer_data = self._get_answer_data()
         if not answer_data:
@@ -190,17 +202,21 @@ class AnswerLessonTaskView(GenericAPIView):
             return data["answer_file"]
 
 
-class SkipLessonTaskView(GenericAPIView):
+class SkipLessonTaskView(UserLessonTaskMixin, GenericAPIView):
     queryset = UserTask.objects.all()
     serializer_class = UserLessonSerializer
     permission_classes = (IsAuthenticated, OneDevicePermission, HaveHomeworkAccess)
 
     def post(self, request, *args, **kwargs):
-        lesson = self._get_user_lesson_or_fail()
+        lesson = self.get_object()
         self._validate_tasks_not_completed(lesson)
 
-        task = self._get_user_lesson_task_or_fail(lesson)
-        task.try_skip()
+        with transaction.atomic():
+            task = self._get_user_lesson_task_or_fail(lesson)
+            task.try_skip()
+
+        if self.wants_ack():
+            return self.get_ack_response(task, lesson=lesson)
 
         serialized_lesson = self.get_serializer(lesson)
         return Response(serialized_lesson.data, status=status.HTTP_200_OK)
@@ -210,36 +226,22 @@ class SkipLessonTaskView(GenericAPIView):
         context.update({"request": self.request})
         return context
 
-    def _get_user_lesson_or_fail(self):
-        pk = self.kwargs["pk"]
-        lesson = UserLesson.objects.available_for_or_404(pk, self.request.user)
-        self.check_object_permissions(self.request, lesson)
-        return lesson
-
-    def _validate_tasks_not_completed(self, lesson: UserLesson):
-        if lesson.status == UserLesson.TASKS_COMPLETED:
-            raise LessonTasksAlreadyCompleted
-
-    def _get_user_lesson_task_or_fail(self, lesson: UserLesson) -> UserTask:
-        task_id = self.kwargs["task_pk"]
-        if not lesson.tasks.filter(pk=task_id).exists():
-            raise LessonNotIncludesTask
-
-        task = get_object_or_404(UserTask, pk=task_id)
-        self.check_object_permissions(self.request, task)
-        return task
-
 
 class HomeworkLessons(ListAPIView):
     queryset = UserLesson.objects.all()
-    serializer_class = UserLessonSerializer
+    serializer_class = UserLessonListSerializer
+    pagination_class = UserLessonPagination
     permission_classes = (IsAuthenticated, OneDevicePermission, HaveHomeworkAccess)
 
     def get_queryset(self):
-        return UserLesson.objects.all_available_for(self.request.user).filter(
-            models.Q(status=UserLesson.COMPLETED)
-            | models.Q(status=UserLesson.TASKS_COMPLETED),
-            lesson__subscriptions__with_home_work=True,
+        return (
+            UserLesson.objects.all_available_for(self.request.user)
+            .filter(
+                models.Q(status=UserLesson.COMPLETED)
+                | models.Q(status=UserLesson.TASKS_COMPLETED),
+                lesson__subscriptions__with_home_work=True,
+            )
+            .for_list()
         )
 
     def get_serializer_context(self):
@@ -250,12 +252,15 @@ class HomeworkLessons(ListAPIView):
 
 class NotCompletedHomeworkLessons(ListAPIView):
     queryset = UserLesson.objects.all()
-    serializer_class = UserLessonSerializer
+    serializer_class = UserLessonListSerializer
+    pagination_class = UserLessonPagination
     permission_classes = (IsAuthenticated, OneDevicePermission, HaveHomeworkAccess)
 
     def get_queryset(self):
-        return UserLesson.objects.all_available_for(self.request.user).filter(
-            status=UserLesson.COMPLETED
+        return (
+            UserLesson.objects.all_available_for(self.request.user)
+            .filter(status=UserLesson.COMPLETED)
+            .for_list()
         )
 
     def get_serializer_context(self):
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ScheduleConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "schedule"
+
+    def ready(self):
+        import schedule.signals
@@ -0,0 +1,109 @@
+"""Материализованный календарь пользователя.
+
+События строятся по урокам пользователя и кэшируются по версии календаря -
+времени последнего изменения его уроков и их количеству. Версия считается
+одним агрегирующим запросом, поэтому опрос без изменений не читает сами
+уроки, а с If-None-Match или since получает пустой ответ.
+"""
+
+import datetime
+
+from django.core.cache import cache
+from django.db import models
+
+from lessons.models import UserLesson
+from schedule.events import build_events
+from schedule.events import get_event_rows
+from schedule.ranges import DateRange
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+EVENTS_KEY = "schedule_events:{user_id}:{version}:{start}:{end}"
+EVENTS_TIMEOUT = 60 * 60 * 24
+
+
+def get_version(user, today: datetime.date) -> str:
+    """Возвращает версию календаря вида <микросекунды>.<уроков>.<день>.
+
+    День входит в версию, потому что от него зависит доступность событий.
+    """
+
+    aggregate = UserLesson._base_manager.filter(user=user).aggregate(
+        updated_at=models.Max("updated_at"),
+        lesson_updated_at=models.Max("lesson__updated_at"),
+        count=models.Count("pk"),
+    )
+    changed_at = max(
+        filter(None, (aggregate["updated_at"], aggregate["lesson_updated_at"])),
+        default=EPOCH,
+    )
+    microseconds = (changed_at - EPOCH) // MICROSECOND
+    return f"{microseconds}.{aggregate['count']}.{today:%Y%m%d}"
+
+
+def parse_version(version: str) -> tuple[datetime.datetime, int, datetime.date] | None:
+    """Возвращает время изменения, количество уроков и день из версии"""
+
+    try:
+        microseconds, count, day = version.split(".")
+        changed_at = EPOCH + int(microseconds) * MICROSECOND
+        day = datetime.datetime.strptime(day, "%Y%m%d").date()
+        count = int(count)
+    except (ValueError, AttributeError, OverflowError):
+        return None
+    if changed_at < EPOCH or count < 0:
+        return None
+    return changed_at, count, day
+
+
+def get_etag(version: str, date_range: DateRange) -> str:
+    return f'"{version}:{date_range.start:%Y%m%d}:{date_range.end:%Y%m%d}"'
+
+
+def get_events(
+    user, version: str, today: datetime.date, date_range: DateRange
+) -> list[dict]:
+    """Возвращает все события календаря пользователя из кэша"""
+
+    key = EVENTS_KEY.format(
+        user_id=user.pk,
+        version=version,
+        start=date_range.start,
+        end=date_range.end,
+    )
+    events = cache.get(key)
+    if events is None:
+        rows = get_event_rows(user, date_range)
+        events = build_events(rows, today, date_range)
+        cache.set(key, events, EVENTS_TIMEOUT)
+    return events
+
+
+def get_changes(
+    user,
+    since: tuple[datetime.datetime, int, datetime.date],
+    version: str,
+    today: datetime.date,
+    date_range: DateRange,
+) -> tuple[bool, list[dict]]:
+    """Возвращает события уроков, изменившихся после версии since.
+
+    Первый элемент - True, если вместо изменений возвращён весь календарь:
+    так бывает, если с тех пор сменился день или урок был удалён - удаление
+    по изменившимся строкам не увидеть.
+    """
+
+    changed_at, count, day = since
+    _, current_count, _ = parse_version(version)
+    if day != today:
+        return True, get_events(user, version, today, date_range)
+
+    created = UserLesson._base_manager.filter(
+        user=user, created_at__gt=changed_at
+    ).count()
+    if count + created != current_count:
+        return True, get_events(user, version, today, date_range)
+
+    rows = get_event_rows(user, date_range, changed_after=changed_at)
+    return False, build_events(rows, today, date_range)
@@ -0,0 +1,3 @@
+from core.catalog import Catalog
+
+HOLIDAYS = Catalog("holidays")
@@ -0,0 +1,98 @@
+"""События расписания пользователя: открытие уроков и сроки домашних заданий"""
+
+import datetime
+
+from django.db import models
+from django.utils import timezone
+
+from lessons.models import Lesson
+from lessons.models import UserLesson
+from schedule.ranges import DateRange
+
+LESSON = "lesson"
+HOMEWORK = "homework"
+
+
+def get_event_rows(
+    user,
+    date_range: DateRange | None = None,
+    *,
+    changed_after: datetime.datetime | None = None,
+) -> list[dict]:
+    """Возвращает уроки пользователя с домашними заданиями одним запросом.
+
+    С date_range - уроки, которые открываются или сдаются в этом диапазоне,
+    с changed_after - только изменившиеся после этого времени.
+    """
+
+    with_home_work = Lesson.subscriptions.through.objects.filter(
+        lesson_id=models.OuterRef("lesson_id"), subscription__with_home_work=True
+    )
+    # the base manager skips the annotations and prefetches of the default one
+    queryset = UserLesson._base_manager.filter(models.Exists(with_home_work), user=user)
+    if changed_after:
+        queryset = queryset.filter(
+            models.Q(updated_at__gt=changed_after)
+            | models.Q(lesson__updated_at__gt=changed_after)
+        )
+    rows = queryset.order_by().values(
+        "lesson_id",
+        "status",
+        "complete_tasks_deadline",
+        "created_at",
+        title=models.F("lesson__title"),
+        opens_at=models.F("lesson__opens_at"),
+    )
+    if date_range is not None:
+        # a union of two range scans instead of an OR across the joined tables
+        deadline_from, deadline_to = date_range.deadline_bounds
+        rows = rows.filter(lesson__opens_at__range=date_range).union(
+            rows.filter(
+                complete_tasks_deadline__gte=deadline_from,
+                complete_tasks_deadline__lt=deadline_to,
+            )
+        )
+    return list(rows.order_by("opens_at", "created_at"))
+
+
+def build_events(
+    rows: list[dict],
+    today: datetime.date | None = None,
+    date_range: DateRange | None = None,
+) -> list[dict]:
+    """Строит события уроков и домашних заданий по строкам get_event_rows.
+
+    С date_range - только события, которые приходятся на этот диапазон.
+    """
+
+    if today is None:
+        today = timezone.now().date()
+
+    lesson_events, homework_events = [], []
+    for row in rows:
+        is_available = row["opens_at"] <= today
+        if date_range is None or date_range.includes(row["opens_at"]):
+            lesson_events.append(
+                {
+                    "id": row["lesson_id"],
+                    "name": row["title"],
+                    "at": row["opens_at"],
+                    "type": LESSON,
+                    "is_available": is_available,
+                    "is_completed": row["status"] == UserLesson.COMPLETED,
+                }
+            )
+        deadline = row["complete_tasks_deadline"]
+        if date_range is None or date_range.includes(timezone.localdate(deadline)):
+            homework_events.append(
+                {
+                    "id": row["lesson_id"],
+                    "name": row["title"],
+                    "at": deadline,
+                    "type": HOMEWORK,
+                    "is_available": is_available
+                    and row["status"] == UserLesson.COMPLETED,
+                    "is_completed": row["status"] == UserLesson.TASKS_COMPLETED,
+                }
+            )
+    return lesson_events + homework_events
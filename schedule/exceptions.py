@@ -0,0 +1,13 @@
+from rest_framework.exceptions import APIException
+
+
+class InvalidScheduleVersion(APIException):
+    status_code = 400
+    default_detail = "Invalid schedule version."
+    default_code = "invalid_version"
+
+
+class InvalidScheduleRange(APIException):
+    status_code = 400
+    default_detail = "Invalid schedule date range."
+    default_code = "invalid_range"
@@ -0,0 +1,94 @@
+"""Диапазон дат календаря.
+
+Границы приходят unix-временем или датой/временем ISO 8601 и переводятся в
+даты часового пояса проекта, а не сервера. Диапазон не шире
+SCHEDULE_MAX_RANGE, поэтому выборка событий - просмотр индексов по
+lesson.opens_at и user_lesson(user_id, complete_tasks_deadline) в
+ограниченном окне.
+"""
+
+import datetime
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils import dateparse
+from django.utils import timezone
+
+from schedule.exceptions import InvalidScheduleRange
+
+
+class DateRange(NamedTuple):
+    start: datetime.date
+    end: datetime.date
+
+    def includes(self, day: datetime.date) -> bool:
+        return self.start <= day <= self.end
+
+    @property
+    def deadline_bounds(self) -> tuple[datetime.datetime, datetime.datetime]:
+        """Полуинтервал времени [начало start, начало дня после end)"""
+
+        tz = timezone.get_current_timezone()
+        return (
+            datetime.datetime.combine(self.start, datetime.time.min, tz),
+            datetime.datetime.combine(
+                self.end + datetime.timedelta(days=1), datetime.time.min, tz
+            ),
+        )
+
+
+def get_range(
+    from_value: str | None, to_value: str | None, today: datetime.date | None = None
+) -> DateRange:
+    """Возвращает диапазон по границам из запроса, сужая его до максимального.
+
+    Недостающие границы отсчитываются от заданной, а без обеих берётся окно
+    вокруг сегодняшнего дня.
+    """
+
+    if today is None:
+        today = timezone.localdate()
+    max_range = settings.SCHEDULE_MAX_RANGE
+
+    start = parse_date(from_value) if from_value else None
+    end = parse_date(to_value) if to_value else None
+    if start and end and start > end:
+        raise InvalidScheduleRange("Schedule range starts after it ends.")
+
+    try:
+        if start is None and end is None:
+            start = today - max_range // 2
+            end = start + max_range
+        elif start is None:
+            start = end - max_range
+        elif end is None or end - start > max_range:
+            end = start + max_range
+    except OverflowError:
+        raise InvalidScheduleRange
+    return DateRange(start, end)
+
+
+def parse_date(value: str) -> datetime.date:
+    """Возвращает дату в часовом поясе проекта по unix-времени или ISO 8601"""
+
+    try:
+        try:
+            return datetime.datetime.fromtimestamp(
+                float(value), tz=timezone.get_current_timezone()
+            ).date()
+        except ValueError:
+            pass
+
+        moment = dateparse.parse_datetime(value)
+        if moment is None:
+            day = dateparse.parse_date(value)
+        elif timezone.is_aware(moment):
+            day = timezone.localdate(moment)
+        else:
+            day = moment.date()
+    except (ValueError, OverflowError, OSError):
+        raise InvalidScheduleRange
+
+    if day is None:
+        raise InvalidScheduleRange
+    return day
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from schedule.catalogs import HOLIDAYS
+from schedule.models import Holiday
+
+
+@receiver(post_save, sender=Holiday)
+@receiver(post_delete, sender=Holiday)
+def invalidate_holidays_catalog(**kwargs):
+    HOLIDAYS.invalidate()
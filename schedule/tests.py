@@ -1,3 +1,111 @@
-from django.test import TestCase
+import datetime
+import uuid
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from django.test import override_settings
+
+from lessons.models import UserLesson
+from schedule import calendar
+from schedule.events import build_events
+from schedule.exceptions import InvalidScheduleRange
+from schedule.ranges import DateRange
+from schedule.ranges import get_range
+
+
+class TestBuildEvents(SimpleTestCase):
+    def test_lesson_and_homework_events(self):
+        today = datetime.date(2024, 9, 2)
+        row = {
+            "lesson_id": uuid.uuid4(),
+            "title": "Title",
+            "opens_at": today,
+            "status": UserLesson.COMPLETED,
+            "complete_tasks_deadline": datetime.datetime(2024, 9, 9, 23, 59, 59),
+        }
+
+        lesson, homework = build_events([row], today)
+
+        self.assertEqual(lesson["type"], "lesson")
+        self.assertEqual(lesson["at"], row["opens_at"])
+        self.assertTrue(lesson["is_available"])
+        self.assertTrue(lesson["is_completed"])
+        self.assertEqual(homework["type"], "homework")
+        self.assertEqual(homework["at"], row["complete_tasks_deadline"])
+        self.assertTrue(homework["is_available"])
+        self.assertFalse(homework["is_completed"])
+
+    def test_closed_lesson(self):
+        today = datetime.date(2024, 9, 2)
+        row = {
+            "lesson_id": uuid.uuid4(),
+            "title": "Title",
+            "opens_at": today + datetime.timedelta(days=1),
+            "status": UserLesson.NOT_STARTED,
+            "complete_tasks_deadline": datetime.datetime(2024, 9, 9, 23, 59, 59),
+        }
+
+        for event in build_events([row], today):
+            self.assertFalse(event["is_available"])
+            self.assertFalse(event["is_completed"])
+
+
+class TestCalendarVersion(SimpleTestCase):
+    def test_parse_version(self):
+        changed_at, count, day = calendar.parse_version("1725235200000001.3.20240902")
+
+        self.assertEqual(
+            changed_at,
+            datetime.datetime(2024, 9, 2, 0, 0, 0, 1, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(count, 3)
+        self.assertEqual(day, datetime.date(2024, 9, 2))
+
+    def test_parse_invalid_version(self):
+        for version in ("", "1.2", "a.1.20240902", "-1.1.20240902", "1.1.2024"):
+            self.assertIsNone(calendar.parse_version(version))
+
+    def test_etag_depends_on_range(self):
+        version = "1725235200000001.3.20240902"
+        end = datetime.date(2024, 9, 30)
+
+        self.assertNotEqual(
+            calendar.get_etag(version, DateRange(datetime.date(2024, 9, 1), end)),
+            calendar.get_etag(version, DateRange(datetime.date(2024, 9, 2), end)),
+        )
+
+
+@override_settings(
+    TIME_ZONE="Europe/Moscow", SCHEDULE_MAX_RANGE=datetime.timedelta(days=30)
+)
+class TestGetRange(SimpleTestCase):
+    today = datetime.date(2024, 9, 2)
+
+    def test_timestamp_in_project_timezone(self):
+        # 2024-09-01 22:00 UTC is already September 2nd in Moscow
+        date_range = get_range("1725228000", "2024-09-10", self.today)
+
+        self.assertEqual(date_range.start, datetime.date(2024, 9, 2))
+
+    def test_aware_datetime(self):
+        date_range = get_range("2024-09-01T22:00:00+00:00", "2024-09-10", self.today)
+
+        self.assertEqual(date_range.start, datetime.date(2024, 9, 2))
+
+    def test_clamp_wide_range(self):
+        date_range = get_range("0", "2024-09-10", self.today)
+
+        self.assertEqual(date_range.end - date_range.start, datetime.timedelta(days=30))
+
+    def test_missing_bounds(self):
+        self.assertEqual(
+            get_range(None, None, self.today),
+            DateRange(datetime.date(2024, 8, 18), datetime.date(2024, 9, 17)),
+        )
+        self.assertEqual(
+            get_range(None, "2024-09-30", self.today).start, datetime.date(2024, 8, 31)
+        )
+
+    def test_invalid_range(self):
+        for from_value, to_value in (("2024-09-10", "2024-09-01"), ("abc", None)):
+            with self.assertRaises(InvalidScheduleRange):
+                get_range(from_value, to_value, self.today)
@@ -1,58 +1,76 @@
 import datetime
 
 from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
 from rest_framework.generics import GenericAPIView
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.catalog import CatalogListMixin
+
+from . import calendar
+from .catalogs import HOLIDAYS
+from .exceptions import InvalidScheduleVersion
+from .ranges import DateRange
+from .ranges import get_range
 from .serializers import *
-from lessons.models import UserLesson
 
 
 class ScheduleListView(GenericAPIView):
+    """Календарь пользователя.
+
+    Отдаёт ETag, версию календаря в заголовке X-Schedule-Version и
+    фактический диапазон дат в X-Schedule-Range. С If-None-Match отвечает
+    304, пока календарь не изменился, а с since=<версия> возвращает только
+    события изменившихся уроков.
+    """
+
+    version_header = "X-Schedule-Version"
+    range_header = "X-Schedule-Range"
+
     def get(self, request, *args, **kwargs):
-        lesson_events = self.create_lesson_events()
-        homework_events = self.create_homework_events()
-        events = lesson_events + homework_events
-        return Response(events)
-
-    def create_lesson_events(self):
-        lessons = self.get_lessons()
-        return LessonEventSerializer(lessons, many=True).data
-
-    def create_homework_events(self):
-        lessons = self.get_lessons()
-        return HomeworkEventSerializer(lessons, many=True).data
-
-    def get_lessons(self):
-        from_date, to_date = self.get_from_date(), self.get_to_date()
-        queryset = UserLesson.objects.filter(
-            user=self.request.user, lesson__subscriptions__with_home_work=True
+        user, today = request.user, timezone.localdate()
+        date_range = get_range(
+            request.query_params.get("from"), request.query_params.get("to"), today
+        )
+        version = calendar.get_version(user, today)
+        headers = {
+            self.version_header: version,
+            self.range_header: f"{date_range.start}/{date_range.end}",
+        }
+
+        since = request.query_params.get("since")
+        if since is not None:
+            return Response(
+                self.get_changes(since, version, today, date_range), headers=headers
+            )
+
+        headers["ETag"] = calendar.get_etag(version, date_range)
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if headers["ETag"] in if_none_match or "*" in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        events = calendar.get_events(user, version, today, date_range)
+        return Response(events, headers=headers)
+
+    def get_changes(
+        self, since: str, version: str, today: datetime.date, date_range: DateRange
+    ) -> dict:
+        if since == version:
+            return {"version": version, "full": False, "events": []}
+
+        parsed = calendar.parse_version(since)
+        if parsed is None:
+            raise InvalidScheduleVersion
+        full, events = calendar.get_changes(
+            self.request.user, parsed, version, today, date_range
         )
-        if from_date:
-            queryset = queryset.filter(lesson__opens_at__gte=from_date)
-        if to_date:
-            queryset = queryset.filter(lesson__opens_at__lte=to_date)
-        return queryset
-
-    def get_from_date(self) -> datetime.date | None:
-        from_timestamp = self.request.query_params.get("from")
-        try:
-            from_date = datetime.datetime.fromtimestamp(int(from_timestamp)).date()
-            return from_date
-        except (ValueError, TypeError):
-            return None
-
-    def get_to_date(self) -> datetime.date | None:
-        to_timestamp = self.request.query_params.get("to")
-        try:
-            to_date = datetime.datetime.fromtimestamp(int(to_timestamp)).date()
-            return to_date
-        except (ValueError, TypeError):
-            return None
-
-
-class HolidaysListView(ListAPIView):
+        return {"version": version, "full": full, "events": events}
+
+
+class HolidaysListView(CatalogListMixin, ListAPIView):
     queryset = Holiday.objects.all()
     serializer_class = HolidaySerializer
+    catalog = HOLIDAYS
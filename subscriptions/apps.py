@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SubscribtionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "subscriptions"
+
+    def ready(self):
+        import subscriptions.signals
@@ -0,0 +1,17 @@
+from core.catalog import Catalog
+from subscriptions.models import Subscription
+
+SUBSCRIPTIONS = Catalog("subscriptions")
+
+
+def get_with_home_work_ids() -> frozenset:
+    """Возвращает id подписок с домашними заданиями"""
+
+    return SUBSCRIPTIONS.get(
+        "with_home_work",
+        lambda: frozenset(
+            Subscription.objects.filter(with_home_work=True).values_list(
+                "pk", flat=True
+            )
+        ),
+    )
@@ -0,0 +1,62 @@
+"""Права пользователя по его активным подпискам.
+
+Для каждого пользователя в кэше хранится Entitlement: id активных подписок,
+есть ли хоть одна и есть ли среди них подписка с домашними заданиями. Запись
+удаляется после коммита при сохранении, удалении и отмене подписки
+пользователя (см. subscriptions/signals.py), а при изменении самих подписок
+устаревает вместе с версией справочника подписок. Поэтому проверки прав в
+горячих запросах не обращаются к базе.
+"""
+
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from subscriptions.catalogs import SUBSCRIPTIONS
+from subscriptions.catalogs import get_with_home_work_ids
+from subscriptions.models import UserSubscription
+
+ENTITLEMENT_KEY = "entitlement:{user_id}"
+ENTITLEMENT_TIMEOUT = 60 * 60
+
+
+class Entitlement(NamedTuple):
+    subscription_ids: frozenset
+    has_active: bool
+    has_home_work: bool
+
+
+def get_entitlement(user) -> Entitlement:
+    key = ENTITLEMENT_KEY.format(user_id=user.pk)
+    catalog_version = SUBSCRIPTIONS.get_version()
+
+    cached = cache.get(key)
+    if cached is not None and cached[0] == catalog_version:
+        return cached[1]
+
+    entitlement = _load_entitlement(user)
+    cache.set(key, (catalog_version, entitlement), ENTITLEMENT_TIMEOUT)
+    return entitlement
+
+
+def invalidate(user_id) -> None:
+    key = ENTITLEMENT_KEY.format(user_id=user_id)
+    cache.delete(key)
+    # readers of the old rows may have cached them again before the commit
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _load_entitlement(user) -> Entitlement:
+    active_ids = list(
+        UserSubscription.objects.filter(
+            user=user, status=UserSubscription.ACTIVE
+        ).values_list("subscription_id", flat=True)
+    )
+    # the subscription of an active user subscription may have been deleted
+    subscription_ids = frozenset(filter(None, active_ids))
+    return Entitlement(
+        subscription_ids=subscription_ids,
+        has_active=bool(active_ids),
+        has_home_work=not subscription_ids.isdisjoint(get_with_home_work_ids()),
+    )
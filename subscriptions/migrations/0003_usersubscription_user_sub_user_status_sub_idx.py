@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usersubscription",
+            index=models.Index(
+                fields=["user", "status", "subscription"],
+                name="user_sub_user_status_sub_idx",
+            ),
+        ),
+    ]
@@ -47,6 +47,12 @@ class UserSubscription(BaseModel):
         db_table = "user_subscription"
         verbose_name = "Подписка пользователя"
         verbose_name_plural = "Подписки пользователей"
+        indexes = (
+            models.Index(
+                fields=("user", "status", "subscription"),
+                name="user_sub_user_status_sub_idx",
+            ),
+        )
 
     subscription = models.ForeignKey(Subscription, on_delete=models.SET_NULL, null=True)
     purchased_at = models.DateTimeField(default=None, null=True)
@@ -60,9 +66,15 @@ class UserSubscription(BaseModel):
         if self.canceled_at:
             raise AlreadyCanceled
 
-        self.status = self.CANCELED
-        self.canceled_at = timezone.now()
-        self.save()
+        if not self.transition(
+            {"canceled_at": None}, status=self.CANCELED, canceled_at=timezone.now()
+        ):
+            raise AlreadyCanceled
+
+        # transition() does not send post_save
+        from subscriptions import entitlements
+
+        entitlements.invalidate(self.user_id)
 
     def __str__(self):
         return f"{self.user.email} ({self.subscription.title})"
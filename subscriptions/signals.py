@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from subscriptions import entitlements
+from subscriptions.catalogs import SUBSCRIPTIONS
+from subscriptions.models import Subscription
+from subscriptions.models import UserSubscription
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_subscriptions_catalog(**kwargs):
+    SUBSCRIPTIONS.invalidate()
+
+
+@receiver(post_save, sender=UserSubscription)
+@receiver(post_delete, sender=UserSubscription)
+def invalidate_entitlement(instance: UserSubscription, **kwargs):
+    entitlements.invalidate(instance.user_id)
@@ -1,3 +1,49 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from subscriptions.entitlements import get_entitlement
+from subscriptions.models import Subscription
+from subscriptions.models import UserSubscription
+
+User = get_user_model()
+
+
+class TestEntitlement(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="random@email.com",
+            password="qwerty12345!",
+            first_name="First",
+            last_name="Last",
+        )
+        self.subscription = Subscription.objects.create(
+            title="Title", price=100, advantages=["Advantage"], with_home_work=True
+        )
+        self.user_subscription = UserSubscription.objects.create(
+            subscription=self.subscription, user=self.user
+        )
+
+    def test_cached_entitlement(self):
+        entitlement = get_entitlement(self.user)
+
+        self.assertTrue(entitlement.has_active)
+        self.assertTrue(entitlement.has_home_work)
+        self.assertEqual(entitlement.subscription_ids, {self.subscription.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_entitlement(self.user), entitlement)
+
+    def test_invalidated_on_cancel(self):
+        get_entitlement(self.user)
+
+        self.user_subscription.cancel()
+
+        self.assertFalse(get_entitlement(self.user).has_active)
+
+    def test_invalidated_on_subscription_change(self):
+        get_entitlement(self.user)
+
+        self.subscription.with_home_work = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subscription.save()
+
+        self.assertFalse(get_entitlement(self.user).has_home_work)
@@ -5,19 +5,22 @@ from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import Response
 
+from core.catalog import CatalogListMixin
 from services.payment import create_payment
+from subscriptions.catalogs import SUBSCRIPTIONS
+from subscriptions.entitlements import get_entitlement
 from subscriptions.exceptions import UserAlreadyHaveSubscription
 from subscriptions.models import Subscription
 from subscriptions.models import SubscriptionOrder
-from subscriptions.models import UserSubscription
 from subscriptions.serializers import OrderSubscriptionSerializer
 from subscriptions.serializers import SubscriptionSerializer
 
 
-class SubscriptionsList(ListAPIView):
+class SubscriptionsList(CatalogListMixin, ListAPIView):
     queryset = Subscription.objects.all()
     permission_classes = (AllowAny,)
     serializer_class = SubscriptionSerializer
+    catalog = SUBSCRIPTIONS
 
 
 class OrderSubscription(GenericAPIView):
@@ -30,13 +33,8 @@ class OrderSubscription(GenericAPIView):
         subscription = self.get_object()
 
         # TODO: maybe add expires_at check or set anywhere to status without expirse_at
-        exists = UserSubscription.objects.filter(
-            user=self.request.user,
-            status=UserSubscription.ACTIVE,
-            subscription=subscription,
-        ).exists()
-
-        if exists:
+        entitlement = get_entitlement(self.request.user)
+        if subscription.pk in entitlement.subscription_ids:
             raise UserAlreadyHaveSubscription
 
         payment = create_payment(
@@ -1,7 +1,6 @@
 import logging
 
 from django.contrib.auth import get_user_model
-from django.db import transaction
 from django.http import HttpResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
@@ -13,8 +12,7 @@ from yookassa.domain.notification import WebhookNotificationFactory
 from .models import Subscription
 from .models import SubscriptionOrder
 from .models import UserSubscription
-from lessons.models import UserLesson
-from tasks.models import UserTask
+from lessons.enrollment import enroll_user
 
 User = get_user_model()
 
@@ -97,37 +95,5 @@ def create_user_lessons(
     """Создать уроки пользователя на купленный месяц, в следствии покупки подписки"""
 
     from_, to = period
-    exists_lessons = UserLesson.objects.filter(user=user).values_list(
-        "lesson_id", flat=True
-    )
-    lessons = (
-        subscription.lesson_set.filter(opens_at__gte=from_, opens_at__lte=to)
-        .exclude(id__in=exists_lessons)
-        .order_by("created_at")
-        .prefetch_related("subscriptions", "tasks")
-    )
-
-    user_lessons = []
-    for lesson in lessons:
-        user_lesson = UserLesson(
-            lesson=lesson,
-            user=user,
-            complete_tasks_deadline=timezone.now(),
-        )
-        user_lessons.append(user_lesson)
-
-    with transaction.atomic():
-        created_user_lessons = UserLesson.objects.bulk_create(user_lessons)
-        lesson_to_user_lesson = {ul.lesson_id: ul for ul in created_user_lessons}
-
-        for lesson in lessons:
-            tasks = []
-            user_lesson = lesson_to_user_lesson[lesson.id]
-
-            for task in lesson.tasks.all():
-                tasks.append(UserTask(task=task))
-
-            UserTask.objects.bulk_create(tasks)
-
-            user_lesson.tasks.add(*tasks)
-            user_lesson.save()
+    lessons = subscription.lesson_set.filter(opens_at__gte=from_, opens_at__lte=to)
+    enroll_user(user.pk, subscription.pk, lessons)
@@ -16,7 +16,8 @@ class TaskFileInline(admin.TabularInline):
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "type")
+    list_display = ("id", "name", "type", "kim_number", "complexity", "cost")
+    list_filter = ("kim_number", "complexity")
     inlines = [TaskFileInline]
 
 
@@ -0,0 +1,220 @@
+import json
+import math
+import re
+from abc import ABC
+from abc import abstractmethod
+
+from django.db import models
+
+from tasks.models import Task
+from tasks.models import UserTask
+
+NUMBER_RE = re.compile(
+    r"^(?P<value>[+-]?\d+(?:[.,]\d+)?)(?:\s*(?:±|\+-)\s*(?P<tolerance>\d+(?:[.,]\d+)?))?$"
+)
+SET_SEPARATOR_RE = re.compile(r"[,;]")
+DEFAULT_TOLERANCE = 1e-9
+GRADE_BATCH_SIZE = 1000
+
+
+def normalize(value) -> str:
+    """Приводит ответ к виду, в котором сравниваются строки"""
+    return " ".join(str(value).casefold().replace("ё", "е").split())
+
+
+def parse_answer(answer: str | None):
+    """Разбирает ответ пользователя: JSON список становится списком частей"""
+    if answer is None:
+        return None
+    answer = answer.strip()
+    if answer.startswith("["):
+        try:
+            parts = json.loads(answer)
+        except ValueError:
+            return answer
+        if isinstance(parts, list):
+            return parts
+    return answer
+
+
+def _to_number(value) -> float | None:
+    try:
+        return float(normalize(value).replace(",", "."))
+    except ValueError:
+        return None
+
+
+class Matcher(ABC):
+    """Проверяет ответ пользователя на задачу"""
+
+    @abstractmethod
+    def __call__(self, answer) -> bool: ...
+
+
+class ExactMatcher(Matcher):
+    """Точное сравнение с эталоном, используется для задач с ответом-файлом"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, answer) -> bool:
+        return answer == self.value
+
+
+class StringMatcher(Matcher):
+    def __init__(self, value):
+        self.value = normalize(value)
+
+    def __call__(self, answer) -> bool:
+        return answer is not None and normalize(answer) == self.value
+
+
+class NumberMatcher(Matcher):
+    def __init__(self, value: float, tolerance: float = DEFAULT_TOLERANCE):
+        self.value = value
+        self.tolerance = tolerance
+
+    def __call__(self, answer) -> bool:
+        number = None if answer is None else _to_number(answer)
+        return number is not None and math.isclose(
+            number, self.value, rel_tol=0, abs_tol=self.tolerance
+        )
+
+
+class UnorderedMatcher(Matcher):
+    """Набор значений, порядок которых не важен: {a; b; c}"""
+
+    def __init__(self, values):
+        self.values = frozenset(normalize(value) for value in values)
+
+    def __call__(self, answer) -> bool:
+        if answer is None:
+            return False
+        if isinstance(answer, str):
+            answer = SET_SEPARATOR_RE.split(answer.strip().strip("{}"))
+        return frozenset(normalize(value) for value in answer) == self.values
+
+
+class MultiPartMatcher(Matcher):
+    """Ответ из нескольких частей, каждая часть проверяется своим матчером"""
+
+    def __init__(self, parts: list[Matcher]):
+        self.parts = parts
+
+    def __call__(self, answer) -> bool:
+        if not isinstance(answer, list) or len(answer) != len(self.parts):
+            return False
+        return all(part(value) for part, value in zip(self.parts, answer))
+
+
+class SinglePartMatcher(Matcher):
+    """Одиночный ответ, присланный списком из одного элемента, тоже засчитывается"""
+
+    def __init__(self, matcher: Matcher):
+        self.matcher = matcher
+
+    def __call__(self, answer) -> bool:
+        if isinstance(answer, list):
+            if isinstance(self.matcher, UnorderedMatcher):
+                return self.matcher(answer)
+            if len(answer) != 1:
+                return False
+            answer = answer[0]
+        return self.matcher(answer)
+
+
+def compile_part(value) -> Matcher:
+    text = str(value).strip()
+    if text.startswith("{") and text.endswith("}"):
+        return UnorderedMatcher(SET_SEPARATOR_RE.split(text[1:-1]))
+
+    number = NUMBER_RE.match(normalize(text))
+    if number is not None:
+        tolerance = number.group("tolerance")
+        return NumberMatcher(
+            float(number.group("value").replace(",", ".")),
+            float(tolerance.replace(",", ".")) if tolerance else DEFAULT_TOLERANCE,
+        )
+    return StringMatcher(text)
+
+
+def compile_answer(correct_answer: str | None, type: str = Task.ANY) -> Matcher:
+    """Компилирует правильный ответ задачи в матчер"""
+
+    if type == Task.FILE or correct_answer is None:
+        return ExactMatcher(correct_answer)
+
+    parts = parse_answer(correct_answer)
+    if isinstance(parts, list):
+        return MultiPartMatcher([compile_part(part) for part in parts])
+
+    return SinglePartMatcher(compile_part(parts))
+
+
+_matchers: dict = {}
+
+
+def get_matcher(task_id, updated_at, correct_answer, type) -> Matcher:
+    """Возвращает скомпилированный матчер задачи, перекомпилирует его после изменения задачи"""
+
+    cached = _matchers.get(task_id)
+    if cached is None or cached[0] != updated_at:
+        cached = (updated_at, compile_answer(correct_answer, type))
+        _matchers[task_id] = cached
+    return cached[1]
+
+
+def grade_many(
+    user_tasks: models.QuerySet,
+    *,
+    skip_unanswered: bool = False,
+    skip_files: bool = False,
+) -> int:
+    """Проверяет ответы на задачи пользователей и сохраняет is_correct.
+
+    С skip_unanswered задачи без ответа помечаются пропущенными и неверными в
+    том же проходе, задачи с файлом только вместе с skip_files. Задачи
+    читаются и сохраняются пачками по GRADE_BATCH_SIZE. Возвращает количество
+    верных ответов.
+    """
+
+    rows = user_tasks.order_by("pk").values_list(
+        "pk",
+        "answer",
+        "task_id",
+        "task__updated_at",
+        "task__correct_answer",
+        "task__type",
+    )
+
+    total = 0
+    last_pk = None
+    while True:
+        batch = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(batch[:GRADE_BATCH_SIZE])
+        if not batch:
+            break
+
+        correct, incorrect, skipped = [], [], []
+        for pk, answer, task_id, updated_at, correct_answer, type in batch:
+            if skip_unanswered and answer is None and (skip_files or type != Task.FILE):
+                skipped.append(pk)
+                continue
+            matcher = get_matcher(task_id, updated_at, correct_answer, type)
+            if type != Task.FILE:
+                answer = parse_answer(answer)
+            (correct if matcher(answer) else incorrect).append(pk)
+
+        tasks = UserTask._base_manager
+        if correct:
+            tasks.filter(pk__in=correct).update(is_correct=True)
+        if incorrect:
+            tasks.filter(pk__in=incorrect).update(is_correct=False)
+        if skipped:
+            tasks.filter(pk__in=skipped).update(is_correct=False, is_skipped=True)
+
+        total += len(correct)
+        if len(batch) < GRADE_BATCH_SIZE:
+            break
+        last_pk = batch[-1][0]
+    return total
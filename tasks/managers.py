@@ -1,14 +1,62 @@
+from typing import cast
+
 from django.db import models
+from rest_framework.exceptions import APIException
+
+
+class UserTaskQuerySet(models.QuerySet):
+    def get_in_parent_or_fail(
+        self,
+        pk: str,
+        user,
+        exception: type[APIException],
+        *,
+        for_update: bool = False,
+        **parent,
+    ):
+        """Возвращает задачу пользователя из урока или варианта одним запросом.
+
+        Родитель передаётся фильтром: lesson=... или uservariant=...
+        """
+
+        queryset = self.filter(pk=pk, user=user, **parent)
+        if for_update:
+            queryset = queryset.select_for_update(of=("self",))
+        obj = queryset.first()
+        if obj is None:
+            raise exception
+        return obj
 
 
 class UserTaskManager(models.Manager):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
+    def get_queryset(self) -> UserTaskQuerySet:
+        return cast(
+            UserTaskQuerySet,
+            UserTaskQuerySet(self.model, using=self._db)
             .select_related("task")
             .annotate(
                 content=models.F("task__content"),
                 type=models.F("task__type"),
+                kim_number=models.F("task__kim_number"),
+            ),
+        )
+
+    def get_in_parent_or_fail(self, *args, **kwargs):
+        return self.get_queryset().get_in_parent_or_fail(*args, **kwargs)
+
+    def progress(self, **parent) -> dict:
+        """Считает отвеченные, пропущенные и все задачи урока или варианта одним запросом"""
+
+        answered = models.Q(answer__isnull=False) | (
+            models.Q(answer_file__isnull=False) & ~models.Q(answer_file="")
+        )
+        return (
+            super()
+            .get_queryset()
+            .filter(**parent)
+            .aggregate(
+                answered=models.Count("pk", filter=answered),
+                skipped=models.Count("pk", filter=models.Q(is_skipped=True)),
+                total=models.Count("pk"),
             )
         )
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="cost",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                help_text="Сколько первичных баллов даёт верный ответ на задачу.",
+                verbose_name="Первичный балл",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="kim_number",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                help_text="Номер задания в КИМ ЕГЭ. По нему упорядочиваются задачи варианта.",
+                null=True,
+                verbose_name="Номер в КИМ",
+            ),
+        ),
+    ]
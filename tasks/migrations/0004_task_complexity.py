@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:13
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_task_kim_number_cost"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="complexity",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                help_text="От 1 до 3. Используется при генерации вариантов.",
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(3),
+                ],
+                verbose_name="Сложность",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["kim_number", "complexity"], name="task_kim_complexity_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def get_progress(user_task) -> int:
+    if user_task.answer is not None or user_task.answer_file:
+        return 2
+    return int(user_task.is_skipped)
+
+
+def delete_duplicate_user_tasks(apps, schema_editor):
+    """Оставляет одну задачу пользователя для каждой пары (урок, задача).
+
+    Остаётся задача с ответом, затем пропущенная, а из равных по прогрессу
+    самая поздно изменённая.
+    """
+
+    UserTask = apps.get_model("tasks", "UserTask")
+    pairs = (
+        UserTask.objects.filter(lesson__isnull=False)
+        .order_by()
+        .values("lesson", "task")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values_list("lesson", "task")
+    )
+    for lesson_id, task_id in pairs:
+        user_tasks = sorted(
+            UserTask.objects.filter(lesson=lesson_id, task=task_id),
+            key=lambda obj: (get_progress(obj), obj.updated_at, obj.pk),
+            reverse=True,
+        )
+        UserTask.objects.filter(
+            pk__in=[user_task.pk for user_task in user_tasks[1:]]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0006_delete_duplicate_user_lessons"),
+        ("tasks", "0004_task_complexity"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_user_tasks, migrations.RunPython.noop),
+    ]
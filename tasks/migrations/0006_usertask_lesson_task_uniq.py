@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lessons", "0007_userlesson_user_lesson_uniq"),
+        ("tasks", "0005_delete_duplicate_user_tasks"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="usertask",
+            constraint=models.UniqueConstraint(
+                fields=("lesson", "task"), name="user_task_lesson_task_uniq"
+            ),
+        ),
+    ]
@@ -1,5 +1,9 @@
+import json
+
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import UploadedFile
+from django.core.validators import MaxValueValidator
+from django.core.validators import MinValueValidator
 from django.db import models
 
 from core.models import BaseModel
@@ -21,6 +25,12 @@ class Task(BaseModel):
         db_table = "task"
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
+        indexes = (
+            # task pools of generated variants, see tasks/pools.py
+            models.Index(
+                fields=("kim_number", "complexity"), name="task_kim_complexity_idx"
+            ),
+        )
 
     name = models.CharField(
         "Название",
@@ -40,6 +50,34 @@ class Task(BaseModel):
     type = models.CharField(
         "Тип ответа на задание", max_length=1, choices=TYPE_CHOICES, default=ANY
     )
+    kim_number = models.PositiveSmallIntegerField(
+        "Номер в КИМ",
+        null=True,
+        blank=True,
+        help_text="Номер задания в КИМ ЕГЭ. По нему упорядочиваются задачи варианта.",
+    )
+    cost = models.PositiveSmallIntegerField(
+        "Первичный балл",
+        default=1,
+        help_text="Сколько первичных баллов даёт верный ответ на задачу.",
+    )
+    complexity = models.PositiveSmallIntegerField(
+        "Сложность",
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(3)],
+        help_text="От 1 до 3. Используется при генерации вариантов.",
+    )
+
+    # the pool the task was loaded from, see tasks/signals.py
+    loaded_pool: tuple[int | None, int] | None = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if "kim_number" in loaded and "complexity" in loaded:
+            instance.loaded_pool = (loaded["kim_number"], loaded["complexity"])
+        return instance
 
     def clean(self):
         if self.type != self.FILE and self.correct_answer is None:
@@ -75,6 +113,11 @@ class UserTask(BaseModel):
         db_table = "user_task"
         verbose_name = "Задача пользователя"
         verbose_name_plural = "Задачи пользователя"
+        constraints = (
+            models.UniqueConstraint(
+                fields=("lesson", "task"), name="user_task_lesson_task_uniq"
+            ),
+        )
 
     task = models.ForeignKey(Task, verbose_name="Задача", on_delete=models.CASCADE)
     user = models.ForeignKey(
@@ -96,11 +139,11 @@ class UserTask(BaseModel):
 
     objects = UserTaskManager()
 
-    def try_answer(self, answer: str | UploadedFile) -> None:
+    def try_answer(self, answer: str | list | UploadedFile) -> None:
         self.is_skipped = False
 
-        if isinstance(answer, str):
-            self.answer = answer
+        if isinstance(answer, (str, list)):
+            self.answer = self.dump_answer(answer)
             self.answer_file = None
         elif isinstance(answer, UploadedFile):
             self.answer_file = answer
@@ -108,7 +151,14 @@ class UserTask(BaseModel):
         else:
             raise ValueError("Unsupported answer type")
 
-        self.save()
+        self.save(update_fields=("answer", "answer_file", "is_skipped", "updated_at"))
+
+    @staticmethod
+    def dump_answer(answer: str | list) -> str:
+        """Приводит текстовый ответ к виду, в котором он хранится в базе"""
+        if isinstance(answer, list):
+            return json.dumps(answer, ensure_ascii=False)
+        return answer
 
     def try_skip(self) -> None:
         if self.is_skipped:
@@ -116,8 +166,9 @@ class UserTask(BaseModel):
         elif self.answer is not None:
             raise TaskAlreadyAnswered
 
-        self.is_skipped = True
-        self.save()
+        if not self.transition({"is_skipped": False, "answer": None}, is_skipped=True):
+            self.refresh_from_db(fields=("is_skipped", "answer"))
+            raise TaskAlreadySkipped if self.is_skipped else TaskAlreadyAnswered
 
     def __str__(self):
         return str(self.task.name)
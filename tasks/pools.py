@@ -0,0 +1,104 @@
+"""Пулы задач для генерации вариантов.
+
+Для каждой пары (номер в КИМ, сложность) в кэше хранится массив id задач,
+а отдельным ключом - какие пары вообще есть. Пулы строятся по индексу
+task_kim_complexity_idx и сбрасываются при изменении задачи и ещё раз после
+коммита (см. tasks/signals.py), поэтому выбор задач для варианта не читает банк
+задач целиком и стоит O(числа заданий в КИМ).
+"""
+
+import random
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from tasks.models import Task
+
+INDEX_KEY = "task_pool:index"
+POOL_KEY = "task_pool:{kim_number}:{complexity}"
+POOL_TIMEOUT = 60 * 60 * 24
+
+
+def sample(complexity: int) -> list:
+    """Выбирает по одной случайной задаче на каждый номер КИМ.
+
+    Если задач нужной сложности для номера нет, берётся ближайшая сложность.
+    """
+
+    index = get_index()
+    buckets = {
+        kim_number: min(complexities, key=lambda c: (abs(c - complexity), c))
+        for kim_number, complexities in index.items()
+    }
+    pools = get_pools(buckets.items())
+    return [
+        random.choice(pools[bucket])
+        for bucket in sorted(buckets.items())
+        if pools.get(bucket)
+    ]
+
+
+def get_index() -> dict[int, list[int]]:
+    """Возвращает сложности, которые есть у задач каждого номера КИМ"""
+
+    index = cache.get(INDEX_KEY)
+    if index is None:
+        index = {}
+        buckets = (
+            Task.objects.filter(kim_number__isnull=False)
+            .values_list("kim_number", "complexity")
+            .order_by("kim_number", "complexity")
+            .distinct()
+        )
+        for kim_number, complexity in buckets:
+            index.setdefault(kim_number, []).append(complexity)
+        cache.set(INDEX_KEY, index, POOL_TIMEOUT)
+    return index
+
+
+def get_pools(buckets) -> dict[tuple[int, int], list]:
+    keys = {
+        POOL_KEY.format(kim_number=kim_number, complexity=complexity): (
+            kim_number,
+            complexity,
+        )
+        for kim_number, complexity in buckets
+    }
+    pools = {keys[key]: pool for key, pool in cache.get_many(list(keys)).items()}
+
+    missing = [bucket for bucket in keys.values() if bucket not in pools]
+    if missing:
+        pools.update(_load_pools(missing))
+        cache.set_many(
+            {
+                POOL_KEY.format(kim_number=kim_number, complexity=complexity): pools[
+                    (kim_number, complexity)
+                ]
+                for kim_number, complexity in missing
+            },
+            POOL_TIMEOUT,
+        )
+    return pools
+
+
+def invalidate(*buckets) -> None:
+    keys = [INDEX_KEY] + [
+        POOL_KEY.format(kim_number=kim_number, complexity=complexity)
+        for kim_number, complexity in buckets
+        if kim_number is not None
+    ]
+    cache.delete_many(keys)
+    # pools rebuilt before the commit may still list a deleted task
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _load_pools(buckets) -> dict[tuple[int, int], list]:
+    pools = {bucket: [] for bucket in buckets}
+    condition = Q(pk__in=[])
+    for kim_number, complexity in buckets:
+        condition |= Q(kim_number=kim_number, complexity=complexity)
+    rows = Task.objects.filter(condition).values_list("pk", "kim_number", "complexity")
+    for pk, kim_number, complexity in rows:
+        pools[(kim_number, complexity)].append(pk)
+    return pools
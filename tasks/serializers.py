@@ -1,8 +1,10 @@
 from rest_framework.serializers import CharField
+from rest_framework.serializers import IntegerField
 from rest_framework.serializers import ModelSerializer
 from rest_framework.serializers import SerializerMethodField
 
 from .models import *
+from core.utils import build_absolute_url
 
 
 class TaskFileSerializer(ModelSerializer):
@@ -16,14 +18,13 @@ class TaskFileSerializer(ModelSerializer):
         )
 
     def get_file(self, obj: TaskFile):
-        request = self.context.get("request")
-        file_url = obj.file.url
-        return request.build_absolute_uri(file_url)
+        return build_absolute_url(self.context, obj.file.url)
 
 
 class UserTaskSerializer(ModelSerializer):
     content = CharField()
     type = CharField()
+    kim_number = IntegerField(allow_null=True)
     files = SerializerMethodField()
     correct_answer = SerializerMethodField()
 
@@ -35,6 +36,7 @@ class UserTaskSerializer(ModelSerializer):
             "answer",
             "answer_file",
             "type",
+            "kim_number",
             "is_correct",
             "is_skipped",
             "created_at",
@@ -44,10 +46,35 @@ class UserTaskSerializer(ModelSerializer):
 
     def get_correct_answer(self, obj: UserTask) -> str | None:
         if self.context.get("show_correct_answer", False):
+            template = getattr(obj, "template", None)
+            if template is not None:
+                return template["correct_answer"]
             return obj.task.correct_answer
         return None
 
     def get_files(self, obj: UserTask):
+        # task data may come from a cached variant template, see variants/snapshots.py
+        template = getattr(obj, "template", None)
+        if template is not None:
+            return [
+                {
+                    "name": file["name"],
+                    "file": build_absolute_url(self.context, file["url"]),
+                }
+                for file in template["files"]
+            ]
         files = obj.task.files.all()
         serializer = TaskFileSerializer(files, many=True, context=self.context)
         return serializer.data
+
+
+class UserTaskAckSerializer(ModelSerializer):
+    class Meta:
+        model = UserTask
+        fields = (
+            "id",
+            "answer",
+            "answer_file",
+            "is_skipped",
+            "updated_at",
+        )
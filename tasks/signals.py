@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from tasks import pools
+from tasks.models import Task
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def refresh_task_pools(instance: Task, **kwargs):
+    buckets = [(instance.kim_number, instance.complexity)]
+    # the task may move to another pool, the old one must be refreshed too
+    if instance.loaded_pool is not None:
+        buckets.append(instance.loaded_pool)
+    pools.invalidate(*buckets)
+    instance.loaded_pool = (instance.kim_number, instance.complexity)
@@ -1,3 +1,173 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
 from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks import grading
+from tasks import pools
+from tasks.grading import Matcher
+from tasks.grading import compile_answer
+from tasks.grading import get_matcher
+from tasks.grading import grade_many
+from tasks.grading import parse_answer
+from tasks.models import Task
+from tasks.models import UserTask
+from tasks.views import AnswerAckMixin
+
+User = get_user_model()
+
+
+class TestGrading(SimpleTestCase):
+    def assertGraded(self, correct_answer: str, answer: str, expected: bool):
+        matcher = compile_answer(correct_answer)
+        self.assertEqual(
+            matcher(parse_answer(answer)), expected, (correct_answer, answer)
+        )
+
+    def test_normalized_string(self):
+        self.assertGraded("Ёлка", "  елка ", True)
+        self.assertGraded("abc", "abd", False)
+
+    def test_number_tolerance(self):
+        self.assertGraded("3,14", "3.14", True)
+        self.assertGraded("3.14 ± 0.01", "3.145", True)
+        self.assertGraded("3.14 ± 0.01", "3.2", False)
+        self.assertGraded("42", "not a number", False)
+
+    def test_unordered_set(self):
+        self.assertGraded("{1; 2; 3}", "3, 1, 2", True)
+        self.assertGraded("{1; 2; 3}", '["2", "3", "1"]', True)
+        self.assertGraded("{1; 2; 3}", "1, 2", False)
+
+    def test_multi_part(self):
+        self.assertGraded('["12", "{a; b}"]', '["12", "b;a"]', True)
+        self.assertGraded('["12", "34"]', '["34", "12"]', False)
+        self.assertGraded('["12", "34"]', '["12"]', False)
+
+    def test_single_part_sent_as_list(self):
+        self.assertGraded("42", '["42"]', True)
+        self.assertGraded("42", '["42", "43"]', False)
+
+    def test_unanswered(self):
+        self.assertGraded("42", None, False)
+
+    def test_file_task(self):
+        self.assertTrue(compile_answer(None, Task.FILE)(None))
+
+    def test_matcher_recompiled_after_update(self):
+        first = get_matcher("task", 1, "1", Task.ANY)
+        self.assertIs(get_matcher("task", 1, "1", Task.ANY), first)
+        self.assertTrue(get_matcher("task", 2, "2", Task.ANY)("2"))
+
+    def test_matcher_without_call(self):
+        class BrokenMatcher(Matcher):
+            pass
+
+        with self.assertRaises(TypeError):
+            BrokenMatcher()
+
+
+class TestAnswerAckMode(SimpleTestCase):
+    def wants_ack(self, path: str = "/", **headers) -> bool:
+        view = AnswerAckMixin()
+        view.request = Request(APIRequestFactory().post(path, **headers))
+        return view.wants_ack()
+
+    def test_full_response_by_default(self):
+        self.assertFalse(self.wants_ack())
+        self.assertFalse(self.wants_ack("/?response=full"))
+
+    def test_query_param(self):
+        self.assertTrue(self.wants_ack("/?response=ack"))
+
+    def test_prefer_header(self):
+        self.assertTrue(self.wants_ack(HTTP_PREFER="return=minimal"))
+        self.assertTrue(self.wants_ack(HTTP_PREFER="respond-async, return = minimal"))
+        self.assertFalse(self.wants_ack(HTTP_PREFER="return=representation"))
+
+
+class TestTaskPools(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def create_task(self, kim_number: int, complexity: int) -> Task:
+        return Task.objects.create(
+            name="Task",
+            content="Content",
+            correct_answer="1",
+            kim_number=kim_number,
+            complexity=complexity,
+        )
+
+    def test_sample_task_per_kim_number(self):
+        first = self.create_task(1, 1)
+        self.create_task(1, 3)
+        second = self.create_task(2, 2)
+        self.create_task(3, 3)
+
+        # the nearest complexity is taken when a number has no task of it
+        self.assertEqual(pools.sample(1)[:2], [first.pk, second.pk])
+        self.assertEqual(len(pools.sample(1)), 3)
+
+    def test_pools_refreshed_on_change(self):
+        task = Task.objects.get(pk=self.create_task(1, 1).pk)
+        self.assertEqual(pools.sample(1), [task.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.complexity = 3
+            task.save()
+        self.assertEqual(pools.get_pools([(1, 1)]), {(1, 1): []})
+        self.assertEqual(pools.sample(3), [task.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(pools.sample(3), [])
+
+    def test_loaded_pool_is_tracked(self):
+        task = Task.objects.get(pk=self.create_task(1, 2).pk)
+
+        self.assertEqual(task.loaded_pool, (1, 2))
+
+
+class TestGradeMany(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email="random@email.com",
+            password="qwerty12345!",
+            first_name="First",
+            last_name="Last",
+        )
+
+    def create_user_task(self, answer: str | None, type: str = Task.ANY) -> UserTask:
+        task = Task.objects.create(
+            name="Task", content="Content", correct_answer="42", type=type
+        )
+        return UserTask.objects.create(task=task, user=self.user, answer=answer)
+
+    @mock.patch.object(grading, "GRADE_BATCH_SIZE", 2)
+    def test_grades_in_batches(self):
+        correct = self.create_user_task("42")
+        incorrect = self.create_user_task("41")
+        unanswered = self.create_user_task(None)
+        file_task = self.create_user_task(None, Task.FILE)
+        another_correct = self.create_user_task(" 42 ")
+
+        user_tasks = UserTask.objects.filter(user=self.user)
+        self.assertEqual(grade_many(user_tasks, skip_unanswered=True), 2)
 
-# Create your tests here.
+        graded = {
+            pk: (is_correct, is_skipped)
+            for pk, is_correct, is_skipped in user_tasks.values_list(
+                "pk", "is_correct", "is_skipped"
+            )
+        }
+        self.assertEqual(graded[correct.pk], (True, False))
+        self.assertEqual(graded[incorrect.pk], (False, False))
+        self.assertEqual(graded[unanswered.pk], (False, True))
+        # file tasks are checked by their answer file, not skipped
+        self.assertEqual(graded[file_task.pk], (False, False))
+        self.assertEqual(graded[another_correct.pk], (True, False))
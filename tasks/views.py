@@ -0,0 +1,43 @@
+from rest_framework.response import Response
+
+from .models import UserTask
+from .serializers import UserTaskAckSerializer
+
+
+class AnswerAckMixin:
+    """Короткий ответ после ответа на задачу или её пропуска.
+
+    Включается параметром ?response=ack или заголовком Prefer: return=minimal,
+    вместо всего урока или варианта возвращает задачу и прогресс по задачам.
+    """
+
+    ack_query_param = "response"
+    ack_query_value = "ack"
+    ack_preference = "return=minimal"
+
+    def wants_ack(self) -> bool:
+        if self.request.query_params.get(self.ack_query_param) == self.ack_query_value:
+            return True
+        return self.ack_preference in self._get_preferences()
+
+    def get_ack_response(self, task: UserTask, **parent) -> Response:
+        data = {
+            "task": UserTaskAckSerializer(
+                task, context=self.get_serializer_context()
+            ).data,
+            "progress": self.get_progress(**parent),
+        }
+        response = Response(data)
+        if self.ack_preference in self._get_preferences():
+            response["Preference-Applied"] = self.ack_preference
+        return response
+
+    def get_progress(self, **parent) -> dict:
+        return UserTask.objects.progress(**parent)
+
+    def _get_preferences(self) -> set[str]:
+        prefer = self.request.headers.get("Prefer", "")
+        return {
+            preference.split(";")[0].strip().replace(" ", "")
+            for preference in prefer.split(",")
+        }
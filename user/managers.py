@@ -1,4 +1,8 @@
+from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
+from django.core.cache import cache
+from django.db import models
+from django.db import transaction
 
 
 class CustomUserManager(BaseUserManager):
@@ -25,3 +29,30 @@ class CustomUserManager(BaseUserManager):
         user.is_staff = True
         user.save()
         return user
+
+
+class UserSessionManager(models.Manager):
+    CACHE_KEY = "user_session:{user_id}"
+    CACHE_FIELDS = ("jti", "ip_address", "fingerprint")
+
+    def get_active_for(self, user_id) -> dict | None:
+        """Возвращает активную сессию пользователя (jti, ip, отпечаток), сначала ищет в кэше"""
+
+        key = self.CACHE_KEY.format(user_id=user_id)
+        session = cache.get(key)
+        if session is None:
+            session = (
+                self.filter(user_id=user_id, is_active=True)
+                .values(*self.CACHE_FIELDS)
+                .first()
+            )
+            if session is not None:
+                timeout = settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds()
+                cache.set(key, session, timeout)
+        return session
+
+    def invalidate_cache_for(self, user_id) -> None:
+        key = self.CACHE_KEY.format(user_id=user_id)
+        cache.delete(key)
+        # readers of the old session may have cached it again before the commit
+        transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+from django.db import migrations, models
+
+
+def deactivate_duplicate_sessions(apps, schema_editor):
+    """Оставляет активной только последнюю сессию каждого пользователя"""
+
+    UserSession = apps.get_model("user", "UserSession")
+    latest = {}
+    active_sessions = UserSession.objects.filter(is_active=True).order_by(
+        "user_id", "-created_at"
+    )
+    duplicates = []
+    for pk, user_id in active_sessions.values_list("pk", "user_id"):
+        if user_id in latest:
+            duplicates.append(pk)
+        else:
+            latest[user_id] = pk
+    UserSession.objects.filter(pk__in=duplicates).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0003_alter_user_telegram"),
+    ]
+
+    operations = [
+        migrations.RunPython(deactivate_duplicate_sessions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="usersession",
+            index=models.Index(
+                fields=["user", "is_active"], name="user_session_user_active_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="usersession",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_active", True)),
+                fields=("user",),
+                name="user_session_one_active",
+            ),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.models import PermissionsMixin
 from django.db import models
 
 from .managers import CustomUserManager
+from .managers import UserSessionManager
 from authentication.tasks import generate_profile_image_for_user_task
 from core.models import BaseModel
 from subscriptions.models import UserSubscription
@@ -46,6 +47,18 @@ class UserSession(BaseModel):
         db_table = "user_session"
         verbose_name = "Сессия пользователя"
         verbose_name_plural = "Сессии пользователей"
+        indexes = (
+            models.Index(
+                fields=("user", "is_active"), name="user_session_user_active_idx"
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=("user",),
+                condition=models.Q(is_active=True),
+                name="user_session_one_active",
+            ),
+        )
 
     user = models.ForeignKey(
         User, verbose_name="Пользователь", on_delete=models.CASCADE
@@ -56,6 +69,8 @@ class UserSession(BaseModel):
     ip_address = models.GenericIPAddressField("IP-адресс", blank=True, null=True)
     is_active = models.BooleanField("Активен", default=True)
 
+    objects = UserSessionManager()
+
     def deactivate(self):
         self.is_active = False
         self.save(update_fields=["is_active"])
@@ -1,6 +1,8 @@
 from rest_framework.permissions import BasePermission
 
+from subscriptions.entitlements import get_entitlement
+
 
 class IsUserHaveSubscription(BasePermission):
     def has_permission(self, request, view):
-        return request.user.subscription.exists()
+        return get_entitlement(request.user).has_active
@@ -39,7 +39,9 @@ class UserSerializer(ModelSerializer):
         return ""
 
     def get_subscriptions(self, obj: User):
-        subscriptions = obj.get_subscriptions()
+        subscriptions = getattr(obj, "active_subscriptions", None)
+        if subscriptions is None:
+            subscriptions = obj.get_subscriptions()
         return UserSubscriptionSerializer(subscriptions, many=True).data
 
     def save(self, **kwargs):
@@ -51,6 +53,19 @@ class UserSerializer(ModelSerializer):
         return data
 
 
+class AuthorSerializer(UserSerializer):
+    """Облегченное представление автора урока, без личных данных"""
+
+    class Meta(UserSerializer.Meta):
+        fields = (
+            "id",
+            "first_name",
+            "last_name",
+            "avatar",
+            "subscriptions",
+        )
+
+
 class EditUserSerializer(Serializer):
     first_name = CharField(required=True, allow_blank=False)
     last_name = CharField(required=True, allow_blank=False)
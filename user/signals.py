@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from user.models import UserSession
+
+
+@receiver(post_save, sender=UserSession)
+@receiver(post_delete, sender=UserSession)
+def invalidate_active_session(instance: UserSession, **kwargs):
+    UserSession.objects.invalidate_cache_for(instance.user_id)
@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import VariantScoreTable
+
+
+@admin.register(VariantScoreTable)
+class VariantScoreTableAdmin(admin.ModelAdmin):
+    list_display = ("primary", "secondary")
+    ordering = ("primary",)
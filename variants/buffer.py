@@ -0,0 +1,224 @@
+"""Буфер ответов на задачи вариантов (write-behind).
+
+Во время массового решения вариантов ответ сначала пишется в кэш отдельной
+неизменяемой записью с порядковым номером из счётчика варианта, а в базу
+попадает пачкой через bulk_update в фоновой задаче flush_variant_answers.
+Номер последней записанной в базу записи хранится в
+UserVariant.flushed_answer_seq.
+
+Ответ кладётся, а буфер сбрасывается под блокировкой строки варианта, поэтому
+сброс видит все записи до текущего значения счётчика и пишет для каждой задачи
+самую новую из них. Записи не удаляются до завершения варианта, так что
+ответ, пришедший во время сброса, не теряется. Завершённый вариант новых
+ответов не принимает, а фоновый сброс его пропускает.
+
+Буферу нужен общий для всех процессов кэш с атомарными add и incr, это
+проверяется при запуске (см. check_cache).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.models import UserTask
+
+ENTRY_KEY = "variant_answer:{variant_id}:{seq}"
+SEQUENCE_KEY = "variant_answer_seq:{variant_id}"
+FLUSH_SCHEDULED_KEY = "variant_answer_flush:{variant_id}"
+ANSWER_TIMEOUT = 60 * 60 * 24
+FLUSH_FIELDS = ("answer", "answer_file", "is_skipped", "updated_at")
+# backends shared by all processes with atomic add and incr
+SHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+    "django_redis.cache.RedisCache",
+)
+
+
+def is_enabled() -> bool:
+    return settings.VARIANT_ANSWER_BUFFER["ENABLED"]
+
+
+def check_cache() -> None:
+    """Не даёт включить буфер с кэшем, у каждого процесса которого своя копия"""
+
+    backend = settings.CACHES["default"]["BACKEND"]
+    if is_enabled() and backend not in SHARED_CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"The variant answer buffer needs a shared cache, got {backend}. "
+            "Use Redis or Memcached or set VARIANT_ANSWER_BUFFER_ENABLED=off."
+        )
+
+
+def put_answer(variant, task: UserTask, answer: str | list) -> None:
+    """Кладёт ответ в буфер и планирует его запись в базу.
+
+    Строка варианта должна быть заблокирована в текущей транзакции.
+    """
+
+    task.answer = UserTask.dump_answer(answer)
+    task.answer_file = None
+    task.is_skipped = False
+
+    # entries are written once: a number reused after eviction of the counter
+    # is skipped instead of overwriting an answer that is not flushed yet
+    while not cache.add(
+        ENTRY_KEY.format(variant_id=variant.pk, seq=_next_sequence(variant)),
+        (task.pk, task.answer),
+        ANSWER_TIMEOUT,
+    ):
+        pass
+
+    transaction.on_commit(lambda: _schedule_flush(variant.pk))
+
+
+def get_pending(variant) -> dict:
+    """Возвращает ответы из буфера, ещё не записанные в базу: {id задачи: ответ}"""
+
+    _, entries = _get_entries(variant.pk, variant.flushed_answer_seq)
+    return _get_latest(entries)
+
+
+def apply_pending(variant, tasks: list[UserTask]) -> list[UserTask]:
+    """Подставляет в задачи ответы из буфера"""
+
+    pending = get_pending(variant)
+    for task in tasks:
+        if task.pk in pending:
+            task.answer = pending[task.pk]
+            task.answer_file = None
+            task.is_skipped = False
+    return tasks
+
+
+def progress(variant) -> dict:
+    """Считает прогресс по задачам варианта с учётом ответов из буфера"""
+
+    rows = list(
+        UserTask._base_manager.filter(uservariant=variant.pk).values_list(
+            "pk", "answer", "answer_file", "is_skipped"
+        )
+    )
+    pending = get_pending(variant)
+
+    answered = skipped = 0
+    for pk, answer, answer_file, is_skipped in rows:
+        if pk in pending or answer is not None or answer_file:
+            answered += 1
+        elif is_skipped:
+            skipped += 1
+    return {"answered": answered, "skipped": skipped, "total": len(rows)}
+
+
+def flush(variant_id) -> int:
+    """Записывает ответы незавершённого варианта из буфера в базу.
+
+    Возвращает количество записанных ответов.
+    """
+
+    from variants.models import UserVariant
+
+    # answers that come in during the flush schedule a new one
+    cache.delete(FLUSH_SCHEDULED_KEY.format(variant_id=variant_id))
+
+    with transaction.atomic():
+        variant = (
+            UserVariant._base_manager.select_for_update()
+            .filter(pk=variant_id)
+            .values("status", "flushed_answer_seq")
+            .first()
+        )
+        # a completed variant was flushed by UserVariant.complete
+        if variant is None or variant["status"] == UserVariant.COMPLETED:
+            return 0
+        return _write(variant_id, variant["flushed_answer_seq"])
+
+
+def flush_completed(variant) -> int:
+    """Записывает ответы завершаемого варианта и очищает буфер после коммита.
+
+    Вызывается в транзакции завершения, где строка варианта уже заблокирована.
+    """
+
+    written = _write(variant.pk, variant.flushed_answer_seq)
+    transaction.on_commit(lambda: clear(variant.pk))
+    return written
+
+
+def clear(variant_id) -> None:
+    sequence_key = SEQUENCE_KEY.format(variant_id=variant_id)
+    last = cache.get(sequence_key) or 0
+    cache.delete_many(
+        [ENTRY_KEY.format(variant_id=variant_id, seq=seq) for seq in range(1, last + 1)]
+        + [sequence_key]
+    )
+
+
+def _write(variant_id, flushed_seq: int) -> int:
+    from variants.models import UserVariant
+
+    last, entries = _get_entries(variant_id, flushed_seq)
+    if last <= flushed_seq:
+        return 0
+
+    latest = _get_latest(entries)
+    if latest:
+        now = timezone.now()
+        UserTask._base_manager.bulk_update(
+            [
+                UserTask(
+                    pk=task_id,
+                    answer=answer,
+                    answer_file=None,
+                    is_skipped=False,
+                    updated_at=now,
+                )
+                for task_id, answer in latest.items()
+            ],
+            FLUSH_FIELDS,
+        )
+    UserVariant._base_manager.filter(pk=variant_id).update(flushed_answer_seq=last)
+    return len(latest)
+
+
+def _next_sequence(variant) -> int:
+    sequence_key = SEQUENCE_KEY.format(variant_id=variant.pk)
+    while True:
+        # after eviction the counter continues from the flushed entries
+        cache.add(sequence_key, variant.flushed_answer_seq, ANSWER_TIMEOUT)
+        try:
+            return cache.incr(sequence_key)
+        except ValueError:
+            continue
+
+
+def _get_entries(variant_id, after: int) -> tuple[int, dict]:
+    """Возвращает значение счётчика и записи с номерами после after"""
+
+    last = cache.get(SEQUENCE_KEY.format(variant_id=variant_id)) or 0
+    if last <= after:
+        return last, {}
+
+    keys = {
+        ENTRY_KEY.format(variant_id=variant_id, seq=seq): seq
+        for seq in range(after + 1, last + 1)
+    }
+    return last, {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+
+
+def _get_latest(entries: dict) -> dict:
+    return {task_id: answer for _, (task_id, answer) in sorted(entries.items())}
+
+
+def _schedule_flush(variant_id) -> None:
+    from variants.tasks import flush_variant_answers
+
+    delay = settings.VARIANT_ANSWER_BUFFER["FLUSH_DELAY"]
+    # if the flush is lost with its worker, the next answer schedules it again
+    if cache.add(
+        FLUSH_SCHEDULED_KEY.format(variant_id=variant_id), True, max(delay, 1) * 12
+    ):
+        flush_variant_answers.apply_async((str(variant_id),), countdown=delay)
@@ -0,0 +1,107 @@
+import time
+from argparse import ArgumentParser
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.models import UserTask
+from variants import scores
+from variants.models import UserVariant
+from variants.models import VariantScoreTable
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Complete many started user variants and report the time and queries "
+        "per completion. All created data is rolled back."
+    )
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument("--count", type=int, default=10_000)
+        parser.add_argument("--tasks", type=int, default=27)
+
+    def handle(self, *args, **options):
+        count, tasks_count = options["count"], options["tasks"]
+
+        with transaction.atomic():
+            variants = self.create_variants(count, tasks_count)
+            self.stdout.write(f"Created {count} variants with {tasks_count} tasks")
+
+            queries = 0
+            started = time.perf_counter()
+            for variant in variants:
+                with CaptureQueriesContext(connection) as context:
+                    variant.complete()
+                queries += len(context.captured_queries)
+            elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+        scores.invalidate()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Completed {count} variants in {elapsed:.2f}s: "
+                f"{elapsed / count * 1000:.2f}ms and "
+                f"{queries / count:.1f} queries per variant"
+            )
+        )
+
+    def create_variants(self, count: int, tasks_count: int) -> list[UserVariant]:
+        user = User.objects.create_user(
+            email=f"bench-{time.time_ns()}@example.com",
+            password="password",
+            first_name="Bench",
+            last_name="Bench",
+        )
+        tasks = Task.objects.bulk_create(
+            Task(
+                name=f"Bench {i}",
+                content="Content",
+                correct_answer=str(i),
+                kim_number=i + 1,
+                cost=1 + i % 2,
+            )
+            for i in range(tasks_count)
+        )
+        max_primary = sum(task.cost for task in tasks)
+        VariantScoreTable.objects.bulk_create(
+            VariantScoreTable(primary=primary, secondary=primary * 2)
+            for primary in range(max_primary + 1)
+        )
+        # the table is rolled back, so the version can't wait for a commit
+        scores.SCORE_TABLE.bump()
+
+        now = timezone.now()
+        variants = UserVariant.objects.bulk_create(
+            UserVariant(
+                title=f"Bench {i}",
+                user=user,
+                complexity=1,
+                status=UserVariant.STARTED,
+                started_at=now,
+            )
+            for i in range(count)
+        )
+
+        through = UserVariant.tasks.through
+        for variant in variants:
+            user_tasks = UserTask.objects.bulk_create(
+                UserTask(
+                    task=task,
+                    user=user,
+                    answer=str(i) if i % 3 else None,
+                )
+                for i, task in enumerate(tasks)
+            )
+            through.objects.bulk_create(
+                through(uservariant_id=variant.pk, usertask_id=user_task.pk)
+                for user_task in user_tasks
+            )
+        return variants
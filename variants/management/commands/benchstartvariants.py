@@ -0,0 +1,84 @@
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tasks.models import Task
+from variants.models import UserVariant
+from variants.models import Variant
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a variant many times from concurrent threads and report "
+        "the throughput. All created data is deleted afterwards."
+    )
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--tasks", type=int, default=30)
+        parser.add_argument("--threads", type=int, default=8)
+
+    def handle(self, *args, **options):
+        count, threads = options["count"], options["threads"]
+        user, variant = self.create_variant(options["tasks"])
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(
+                    executor.map(
+                        lambda _: self.start_variant(variant, user), range(count)
+                    )
+                )
+            elapsed = time.perf_counter() - started
+        finally:
+            self.cleanup(user, variant)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Started {count} variants in {threads} threads in {elapsed:.2f}s: "
+                f"{count / elapsed:.1f} starts/s, "
+                f"{elapsed / count * threads * 1000:.2f}ms per start"
+            )
+        )
+
+    def create_variant(self, tasks_count: int) -> tuple[User, Variant]:
+        user = User.objects.create_user(
+            email=f"bench-{time.time_ns()}@example.com",
+            password="password",
+            first_name="Bench",
+            last_name="Bench",
+        )
+        tasks = Task.objects.bulk_create(
+            Task(
+                name=f"Bench {i}",
+                content="Content",
+                correct_answer=str(i),
+                kim_number=i + 1,
+            )
+            for i in range(tasks_count)
+        )
+        variant = Variant.objects.create(title="Bench")
+        variant.tasks.add(*tasks)
+        return user, variant
+
+    @staticmethod
+    def start_variant(variant: Variant, user: User) -> None:
+        try:
+            UserVariant.objects.create_from(variant, user)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def cleanup(user: User, variant: Variant) -> None:
+        task_ids = list(variant.tasks.values_list("pk", flat=True))
+        # user tasks and user variants are deleted by cascade
+        user.delete()
+        variant.delete()
+        Task.objects.filter(pk__in=task_ids).delete()
@@ -1,21 +1,52 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db import transaction
+
+from tasks import pools
+from tasks.models import UserTask
+from variants import snapshots
 
 User = get_user_model()
 
 
 class UserVariantManager(models.Manager):
-    pass
-
-    # def create_from(self, variant: Variant, user: User):
-    #     """Create UserVariant from Variant"""
-    #
-    #     user_variant = UserVariant(title=variant.title, user=user)
-    #     user_variant.save()
-    #     tasks = []
-    #     for task in variant.tasks.all():
-    #         tasks.append(UserVariantTask(task=task))
-    #     UserVariantTask.objects.bulk_create(tasks)
-    #     user_variant.tasks.add(*tasks)
-    #     user_variant.save()
-    #     return user_variant
+    def create_from(self, variant, user: User):
+        """Создаёт вариант пользователя из варианта вместе с его задачами"""
+        return self.create_from_template(snapshots.get_template(variant.pk), user)
+
+    def create_from_template(self, template: dict, user: User):
+        """Создаёт вариант пользователя из шаблона варианта"""
+
+        return self._create_with_tasks(
+            [task["id"] for task in template["tasks"]],
+            title=template["title"],
+            user=user,
+            variant_id=template["id"],
+            complexity=1,  # TODO: update complexity logic
+        )
+
+    def generate(self, title: str, complexity: int, user: User):
+        """Генерирует вариант из случайных задач нужной сложности по каждому номеру КИМ"""
+
+        return self._create_with_tasks(
+            pools.sample(complexity),
+            title=title,
+            user=user,
+            complexity=complexity,
+            generated=True,
+        )
+
+    @transaction.atomic
+    def _create_with_tasks(self, task_ids: list, **fields):
+        """Число запросов не зависит от количества задач в варианте"""
+
+        user_variant = self.create(**fields)
+        user_tasks = UserTask.objects.bulk_create(
+            UserTask(task_id=task_id, user=user_variant.user) for task_id in task_ids
+        )
+        through = self.model.tasks.through
+        through.objects.bulk_create(
+            through(uservariant_id=user_variant.pk, usertask_id=user_task.pk)
+            for user_task in user_tasks
+        )
+        return user_variant
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_initial"),
+        ("variants", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="uservariant",
+            index=models.Index(
+                fields=["user", "-completed_at", "started_at", "id"],
+                name="user_variant_keyset_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("variants", "0002_uservariant_user_variant_keyset_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="uservariant",
+            name="variant",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="user_variants",
+                to="variants.variant",
+            ),
+        ),
+    ]
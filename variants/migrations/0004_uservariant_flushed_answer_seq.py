@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("variants", "0003_uservariant_variant"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="uservariant",
+            name="flushed_answer_seq",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
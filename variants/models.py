@@ -4,11 +4,15 @@ from django.core.validators import (
     MinValueValidator,
 )
 from django.db import models
+from django.db import transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from core.models import BaseModel
+from tasks.grading import grade_many
 from tasks.models import Task, UserTask
+from . import buffer
+from . import scores
 from .exceptions import VariantAlreadyCompleted, VariantAlreadyStarted
 from .managers import UserVariantManager
 
@@ -65,9 +69,23 @@ class UserVariant(BaseModel):
         )
         verbose_name = "Вариант"
         verbose_name_plural = "Варианты"
+        indexes = (
+            # keyset pagination of user variants, see UserVariantPagination
+            models.Index(
+                fields=("user", "-completed_at", "started_at", "id"),
+                name="user_variant_keyset_idx",
+            ),
+        )
 
     title = models.CharField(max_length=255)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    variant = models.ForeignKey(
+        Variant,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="user_variants",
+    )
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default=NOT_STARTED)
     started_at = models.DateTimeField(null=True)
     completed_at = models.DateTimeField(null=True)
@@ -77,6 +95,8 @@ class UserVariant(BaseModel):
         validators=[MinValueValidator(1), MaxValueValidator(3)]
     )
     result = models.IntegerField(default=None, null=True)
+    # the last buffered answer written to the database, see variants/buffer.py
+    flushed_answer_seq = models.PositiveBigIntegerField(default=0, editable=False)
 
     objects = UserVariantManager()
 
@@ -84,19 +104,26 @@ class UserVariant(BaseModel):
         if self.started_at:
             raise VariantAlreadyStarted
 
-        self.started_at = timezone.now()
-        self.status = self.STARTED
-        self.save()
+        if not self.transition(
+            {"started_at": None}, started_at=timezone.now(), status=self.STARTED
+        ):
+            raise VariantAlreadyStarted
 
+    @transaction.atomic
     def complete(self):
         if self.completed_at:
             raise VariantAlreadyCompleted
 
-        self.completed_at = timezone.now()
-        self.status = self.COMPLETED
-        self.tasks.filter(answer=None).update(is_correct=False, is_skipped=True)
+        # the conditional update lets only one of concurrent requests grade tasks
+        if not self.transition(
+            {"completed_at": None}, completed_at=timezone.now(), status=self.COMPLETED
+        ):
+            raise VariantAlreadyCompleted
+
+        buffer.flush_completed(self)
+        grade_many(self.tasks.all(), skip_unanswered=True, skip_files=True)
         self.result = self._get_result()
-        self.save()
+        self.save(update_fields=("result", "updated_at"))
 
     @property
     def is_started(self):
@@ -107,10 +134,7 @@ class UserVariant(BaseModel):
         return self.status == self.COMPLETED
 
     def _get_result(self) -> int:
-        try:
-            total_primary_score = self.tasks. \
-                filter(is_correct=True). \
-                aggregate(total_cost=models.Sum("cost"))["total_cost"]
-            return VariantScoreTable.objects.get(primary=total_primary_score).secondary
-        except models.ObjectDoesNotExist:
-            return 0
+        primary = UserTask._base_manager.filter(uservariant=self).aggregate(
+            primary=models.Sum("task__cost", filter=models.Q(is_correct=True))
+        )["primary"]
+        return scores.to_secondary(primary or 0)
@@ -0,0 +1,37 @@
+"""Перевод первичных баллов варианта во вторичные.
+
+Таблица VariantScoreTable хранится справочником (см. core/catalog.py)
+массивом, где индекс - первичный балл, а значение - вторичный. Справочник
+сбрасывается при изменении таблицы (см. variants/signals.py).
+"""
+
+from core.catalog import Catalog
+
+SCORE_TABLE = Catalog("variant_score_table")
+
+
+def to_secondary(primary: int | None) -> int:
+    """Возвращает вторичный балл, 0 если первичного балла нет в таблице"""
+
+    table = SCORE_TABLE.get("table", _load_table)
+    if primary is None or not 0 <= primary < len(table):
+        return 0
+    return table[primary]
+
+
+def invalidate() -> None:
+    SCORE_TABLE.invalidate()
+
+
+def _load_table() -> tuple[int, ...]:
+    from variants.models import VariantScoreTable
+
+    rows = VariantScoreTable.objects.values_list("primary", "secondary")
+    table = []
+    for primary, secondary in rows:
+        if primary < 0:
+            continue
+        if primary >= len(table):
+            table.extend([0] * (primary + 1 - len(table)))
+        table[primary] = secondary
+    return tuple(table)
@@ -8,6 +8,8 @@ from rest_framework.serializers import (
 )
 
 from tasks.serializers import UserTaskSerializer
+from . import buffer
+from . import snapshots
 from .models import *
 
 
@@ -47,7 +49,7 @@ class UserVariantSerializer(ModelSerializer):
     def prepare_tasks(self, tasks: list, *, hide_correctness: bool) -> list:
         if hide_correctness:
             tasks = self.hide_tasks_correctness(tasks)
-        return sorted(tasks, key=lambda task: task["kim_number"])
+        return tasks
 
     def hide_tasks_correctness(self, tasks: list) -> list:
         for i in range(len(tasks)):
@@ -55,11 +57,13 @@ class UserVariantSerializer(ModelSerializer):
         return tasks
 
     def get_tasks(self, obj: UserVariant):
-        tasks = (
-            obj.tasks.prefetch_related("task", "task__files")
-            .all()
-            .order_by("task__kim_number")
-        )
+        tasks = self._get_tasks_from_template(obj)
+        if tasks is None:
+            tasks = obj.tasks.prefetch_related("task__files").order_by(
+                "task__kim_number", "created_at"
+            )
+        if buffer.is_enabled() and not obj.is_completed:
+            tasks = buffer.apply_pending(obj, list(tasks))
         context = self.context.copy()
         context.update({"show_correct_answer": obj.is_completed})
         serializer = UserTaskSerializer(
@@ -67,6 +71,30 @@ class UserVariantSerializer(ModelSerializer):
         )
         return serializer.data
 
+    def _get_tasks_from_template(self, obj: UserVariant) -> list[UserTask] | None:
+        """Берёт общие данные задач из шаблона варианта, из базы - только ответы"""
+
+        if obj.variant_id is None:
+            return None
+        template = snapshots.get_template(obj.variant_id)
+        if template is None:
+            return None
+
+        template_tasks = {task["id"]: task for task in template["tasks"]}
+        tasks = list(UserTask._base_manager.filter(uservariant=obj))
+        # the variant tasks changed after the user started it
+        if any(task.task_id not in template_tasks for task in tasks):
+            return None
+
+        order = {task_id: i for i, task_id in enumerate(template_tasks)}
+        tasks.sort(key=lambda task: order[task.task_id])
+        for task in tasks:
+            task.template = template_tasks[task.task_id]
+            task.content = task.template["content"]
+            task.type = task.template["type"]
+            task.kim_number = task.template["kim_number"]
+        return tasks
+
 
 class UserVariantWithoutTasksSerializer(UserVariantSerializer):
     def to_representation(self, instance):
@@ -0,0 +1,50 @@
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from tasks.models import Task
+from tasks.models import TaskFile
+from variants import scores
+from variants import snapshots
+from variants.models import Variant
+from variants.models import VariantScoreTable
+
+
+@receiver(post_save, sender=VariantScoreTable)
+@receiver(post_delete, sender=VariantScoreTable)
+def invalidate_score_table(**kwargs):
+    scores.invalidate()
+
+
+@receiver(post_save, sender=Variant)
+@receiver(post_delete, sender=Variant)
+def invalidate_variant_template(instance: Variant, **kwargs):
+    snapshots.invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=Variant.tasks.through)
+def invalidate_variant_template_on_tasks_change(
+    instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+):
+    if not reverse:
+        if action.startswith("post_"):
+            snapshots.invalidate(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        snapshots.invalidate(*pk_set)
+    elif action == "pre_clear":
+        snapshots.invalidate_for_tasks([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+@receiver(pre_delete, sender=Task)
+def invalidate_variant_templates_on_task_change(instance: Task, **kwargs):
+    # deleted tasks are handled in pre_delete, while they are still linked to variants
+    snapshots.invalidate_for_tasks([instance.pk])
+
+
+@receiver(post_save, sender=TaskFile)
+@receiver(post_delete, sender=TaskFile)
+def invalidate_variant_templates_on_file_change(instance: TaskFile, **kwargs):
+    snapshots.invalidate_for_tasks([instance.task_id])
@@ -0,0 +1,81 @@
+"""Шаблоны вариантов.
+
+Шаблон - неизменяемый снимок общей для всех учеников части варианта: название
+и упорядоченные по номеру в КИМ задачи с содержанием и файлами. Он хранится
+в кэше и удаляется при изменении варианта, его задач или их файлов, а затем
+ещё раз после коммита (см. variants/signals.py), поэтому при старте и показе
+варианта из базы читается только состояние задач конкретного ученика.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+from tasks.models import Task
+
+TEMPLATE_KEY = "variant_template:{variant_id}"
+TEMPLATE_TIMEOUT = 60 * 60 * 24
+
+
+def get_template(variant_id) -> dict | None:
+    """Возвращает шаблон варианта, None если варианта нет"""
+
+    key = TEMPLATE_KEY.format(variant_id=variant_id)
+    template = cache.get(key)
+    if template is None:
+        template = build_template(variant_id)
+        if template is not None:
+            cache.set(key, template, TEMPLATE_TIMEOUT)
+    return template
+
+
+def build_template(variant_id) -> dict | None:
+    from variants.models import Variant
+
+    variant = Variant.objects.filter(pk=variant_id).values("id", "title").first()
+    if variant is None:
+        return None
+
+    tasks = (
+        Task.objects.filter(variant=variant_id)
+        .order_by("kim_number", "id")
+        .prefetch_related("files")
+    )
+    return {
+        "id": variant["id"],
+        "title": variant["title"],
+        "tasks": [
+            {
+                "id": task.pk,
+                "content": task.content,
+                "type": task.type,
+                "kim_number": task.kim_number,
+                "correct_answer": task.correct_answer,
+                "files": [
+                    {"name": file.name, "url": file.file.url}
+                    for file in task.files.all()
+                ],
+            }
+            for task in tasks
+        ],
+    }
+
+
+def invalidate(*variant_ids) -> None:
+    keys = [TEMPLATE_KEY.format(variant_id=variant_id) for variant_id in variant_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # readers of the old rows may have cached them again before the commit
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_for_tasks(task_ids) -> None:
+    """Удаляет шаблоны всех вариантов, в которые входят задачи"""
+
+    from variants.models import Variant
+
+    invalidate(
+        *Variant.tasks.through.objects.filter(task_id__in=task_ids).values_list(
+            "variant_id", flat=True
+        )
+    )
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from variants import buffer
+
+
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def flush_variant_answers(variant_id):
+    buffer.flush(variant_id)
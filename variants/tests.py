@@ -1,3 +1,109 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.models import UserTask
+from variants import buffer
+from variants.models import UserVariant
+
+User = get_user_model()
+
+BUFFER_ENABLED = {"ENABLED": True, "FLUSH_DELAY": 5}
+
+
+@override_settings(VARIANT_ANSWER_BUFFER=BUFFER_ENABLED)
+@mock.patch("variants.tasks.flush_variant_answers.apply_async")
+class TestAnswerBuffer(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user = User.objects.create_user(
+            email="random@email.com",
+            password="qwerty12345!",
+            first_name="First",
+            last_name="Last",
+        )
+        task = Task.objects.create(name="Task", content="Content", correct_answer="b")
+        self.task = UserTask.objects.create(task=task, user=user)
+        self.variant = UserVariant.objects.create(
+            title="Variant",
+            user=user,
+            complexity=1,
+            status=UserVariant.STARTED,
+            started_at=timezone.now(),
+        )
+        self.variant.tasks.add(self.task)
+
+    def put_answer(self, answer: str) -> None:
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            variant = UserVariant.objects.select_for_update().get(pk=self.variant.pk)
+            buffer.put_answer(variant, self.task, answer)
+
+    def get_saved_answer(self) -> str | None:
+        return UserTask.objects.values_list("answer", flat=True).get(pk=self.task.pk)
+
+    def test_newer_answer_wins(self, apply_async):
+        self.put_answer("a")
+        self.put_answer("b")
+
+        self.assertEqual(buffer.flush(self.variant.pk), 1)
+        self.assertEqual(self.get_saved_answer(), "b")
+        apply_async.assert_called_once()
+
+    def test_answer_during_flush_is_kept(self, apply_async):
+        self.put_answer("a")
+        get_entries = buffer._get_entries
+
+        def get_entries_and_answer(*args):
+            entries = get_entries(*args)
+            self.put_answer("b")
+            return entries
+
+        with mock.patch.object(buffer, "_get_entries", get_entries_and_answer):
+            buffer.flush(self.variant.pk)
+
+        self.assertEqual(self.get_saved_answer(), "a")
+        self.variant.refresh_from_db()
+        self.assertEqual(buffer.get_pending(self.variant), {self.task.pk: "b"})
+
+        buffer.flush(self.variant.pk)
+        self.assertEqual(self.get_saved_answer(), "b")
+
+    def test_complete_writes_and_clears_buffer(self, apply_async):
+        self.put_answer("b")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.variant.complete()
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.answer, "b")
+        self.assertTrue(self.task.is_correct)
+        self.assertEqual(buffer.get_pending(self.variant), {})
+
+    def test_completed_variant_is_not_flushed(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.variant.complete()
+        # an answer that was buffered despite the completion
+        self.put_answer("b")
+
+        self.assertEqual(buffer.flush(self.variant.pk), 0)
+        self.assertIsNone(self.get_saved_answer())
+
+    def test_rolled_back_completion_keeps_buffer(self, apply_async):
+        self.put_answer("b")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.variant.complete()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
 
-# Create your tests here.
+        self.variant.refresh_from_db()
+        self.assertEqual(buffer.get_pending(self.variant), {self.task.pk: "b"})
@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.generics import GenericAPIView
 from rest_framework.generics import ListAPIView
@@ -5,6 +7,11 @@ from rest_framework.generics import RetrieveAPIView
 from rest_framework.mixins import Response
 from rest_framework.permissions import IsAuthenticated
 
+from core.pagination import UserVariantPagination
+from tasks.views import AnswerAckMixin
+from user.permissions import IsUserHaveSubscription
+from . import buffer
+from . import snapshots
 from .exceptions import *
 from .serializers import *
 
@@ -26,19 +33,15 @@ class StartVariantView(GenericAPIView):
     queryset = Variant.objects.all()
 
     def post(self, request, *args, **kwargs):
-        variant = get_object_or_404(Variant, pk=self.kwargs["pk"])
-
-        user_tasks = [UserTask(task=task) for task in variant.tasks.all()]
-        UserTask.objects.bulk_create(user_tasks)
-
-        user_variant = UserVariant.objects.create(
-            title=variant.title,
-            user=self.request.user,
-            complexity=1,  # TODO: update complexity logic
+        template = snapshots.get_template(self.kwargs["pk"])
+        if template is None:
+            raise Http404
+        user_variant = UserVariant.objects.create_from_template(
+            template, self.request.user
+        )
+        return Response(
+            UserVariantSerializer(user_variant, context={"request": request}).data
         )
-        user_variant.tasks.add(*user_tasks)
-
-        return Response(UserVariantSerializer(user_variant).data)
 
 
 class UserVariantsView(ListAPIView):
@@ -46,6 +49,7 @@ class UserVariantsView(ListAPIView):
 
     queryset = UserVariant.objects.all()
     serializer_class = UserVariantWithoutTasksSerializer
+    pagination_class = UserVariantPagination
 
     def filter_queryset(self, queryset):
         queryset = queryset.filter(user=self.request.user)
@@ -127,15 +131,60 @@ class CompleteUserVariantView(GenericAPIView):
         return context
 
 
-class AnswerUserVariantTaskView(GenericAPIView):
+class UserVariantTaskMixin(AnswerAckMixin):
+    """Находит вариант пользователя и его задачу, которую собираются изменить"""
+
+    def _get_user_variant_or_fail(self, *, for_update: bool = False):
+        queryset = UserVariant.objects.all()
+        if for_update:
+            queryset = queryset.select_for_update(of=("self",))
+        return get_object_or_404(queryset, pk=self.kwargs["pk"], user=self.request.user)
+
+    def _validate_started_and_not_completed(self, variant: UserVariant):
+        if not variant.is_started:
+            raise VariantNotStarted
+        if variant.is_completed:
+            raise VariantCompleted
+
+    def _get_user_variant_task_or_fail(
+        self, variant: UserVariant, *, for_update: bool = True
+    ) -> UserTask:
+        return UserTask.objects.get_in_parent_or_fail(
+            self.kwargs["task_pk"],
+            self.request.user,
+            VariantNotIncludesTask,
+            for_update=for_update,
+            uservariant=variant,
+        )
+
+    def get_progress(self, **parent) -> dict:
+        if buffer.is_enabled():
+            return buffer.progress(parent["uservariant"])
+        return super().get_progress(**parent)
+
+
+class AnswerUserVariantTaskView(UserVariantTaskMixin, GenericAPIView):
     serializer_class = UserVariantSerializer
 
     def post(self, request, *args, **kwargs):
-        variant = self._get_user_variant_or_fail()
-        self._validate_started_and_not_completed(variant)
-
-        task = self._get_user_variant_task_or_fail(variant)
-        self._try_to_answer_task(task)
+        if buffer.is_enabled():
+            answer_data = self._get_answer_data_or_fail()
+            # completion waits for the lock, so it sees every buffered answer
+            with transaction.atomic():
+                variant = self._get_user_variant_or_fail(for_update=True)
+                self._validate_started_and_not_completed(variant)
+                task = self._get_user_variant_task_or_fail(variant, for_update=False)
+                buffer.put_answer(variant, task, answer_data)
+        else:
+            variant = self._get_user_variant_or_fail()
+            self._validate_started_and_not_completed(variant)
+            answer_data = self._get_answer_data_or_fail()
+            with transaction.atomic():
+                task = self._get_user_variant_task_or_fail(variant)
+                task.try_answer(answer_data)
+
+        if self.wants_ack():
+            return self.get_ack_response(task, uservariant=variant)
 
         serialized_variant = self.get_serializer(variant)
         return Response(serialized_variant.data)
@@ -145,45 +194,31 @@ class AnswerUserVariantTaskView(GenericAPIView):
         context.update({"request": self.request})
         return context
 
-    def _get_user_variant_or_fail(self):
-        return get_object_or_404(
-            UserVariant, pk=self.kwargs["pk"], user=self.request.user
-        )
-
-    def _validate_started_and_not_completed(self, variant: UserVariant):
-        if not variant.is_started:
-            raise VariantNotStarted
-        if variant.is_completed:
-            raise VariantCompleted
-
-    def _get_user_variant_task_or_fail(self, variant: UserVariant):
-        task_id = self.kwargs["task_pk"]
-        if not variant.tasks.filter(pk=task_id).exists():
-            raise VariantNotIncludesTask
-
-        return get_object_or_404(UserTask, pk=task_id)
-
-    def _try_to_answer_task(self, task: UserTask):
-        answer_data = self._get_answer_data()
-        if not answer_data or not all(answer_data):
-            raise AnswerIsEmptyError
-        task.try_answer(answer_data)
-
-    def _get_answer_data(self) -> list:
+    def _get_answer_data_or_fail(self) -> list:
         serializer = AnswerTaskSerializer(data=self.request.data)
         serializer.is_valid(raise_exception=True)
-        return serializer.validated_data.get("answer", [])
+        answer_data = serializer.validated_data.get("answer", [])
+        if not answer_data or not all(answer_data):
+            raise AnswerIsEmptyError
+        return answer_data
 
 
-class SkipUserVariantTaskView(GenericAPIView):
+class SkipUserVariantTaskView(UserVariantTaskMixin, GenericAPIView):
     serializer_class = UserVariantSerializer
 
     def post(self, request, *args, **kwargs):
         variant = self._get_user_variant_or_fail()
         self._validate_started_and_not_completed(variant)
 
-        task = self._get_user_variant_task_or_fail(variant)
-        task.try_skip()
+        if buffer.is_enabled():
+            # a buffered answer must reach the database before it is checked
+            buffer.flush(variant.pk)
+        with transaction.atomic():
+            task = self._get_user_variant_task_or_fail(variant)
+            task.try_skip()
+
+        if self.wants_ack():
+            return self.get_ack_response(task, uservariant=variant)
 
         serialized_variant = self.get_serializer(variant)
         return Response(serialized_variant.data)
@@ -193,26 +228,7 @@ class SkipUserVariantTaskView(GenericAPIView):
         context.update({"request": self.request})
         return context
 
-    def _get_user_variant_or_fail(self):
-        return get_object_or_404(
-            UserVariant, pk=self.kwargs["pk"], user=self.request.user
-        )
-
-    def _validate_started_and_not_completed(self, variant: UserVariant):
-        if not variant.is_started:
-            raise VariantNotStarted
-        if variant.is_completed:
-            raise VariantCompleted
-
-    def _get_user_variant_task_or_fail(self, variant: UserVariant):
-        task_id = self.kwargs["task_pk"]
-        if not variant.tasks.filter(pk=task_id).exists():
-            raise VariantNotIncludesTask
-
-        return get_object_or_404(UserTask, pk=task_id)
 
-
-"""
 class GenerateVariantView(GenericAPIView):
     serializer_class = GenerateVariantSerializer
     permission_classes = (IsAuthenticated, IsUserHaveSubscription)
@@ -220,30 +236,12 @@ class GenerateVariantView(GenericAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        variant = self._generate_variant(
-            serializer.data["name"], serializer.data["complexity"]
+        variant = UserVariant.objects.generate(
+            serializer.validated_data["name"],
+            serializer.validated_data["complexity"],
+            self.request.user,
         )
-        return Response(UserVariantSerializer(variant).data, status=200)
-
-    def _generate_variant(self, name: str, complexity: int):
-        variant = UserVariant(
-            title=name, user=self.request.user, complexity=complexity, generated=True
+        return Response(
+            UserVariantSerializer(variant, context={"request": request}).data,
+            status=200,
         )
-        variant.save()
-        sorted_tasks = Task.objects.all()
-
-        tasks_by_kim_number = {}
-        for task in sorted_tasks:
-            tasks_by_kim_number.setdefault(task.kim_number, []).append(task)
-
-        tasks = []
-        for n in range(min_kim_number, max_kim_number + 1):
-            if n in tasks_by_kim_number:
-                task = random.choice(tasks_by_kim_number[n])
-                tasks.append(UserTask(task=task))
-
-        UserTask.objects.bulk_create(tasks)
-        variant.tasks.add(*tasks)
-        variant.save()
-        return variant
-    """